@@ -1,88 +1,147 @@
-import requests
-from bs4 import BeautifulSoup, Tag
-import json
+# requests, selectolax and orjson are imported where they are used so that
+# loading this module (e.g. just to call save_to_json) stays cheap
 import sys
-import io
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+# Progress is reported every 1024 records (power-of-two mask keeps the check cheap)
+PROGRESS_MASK = 0x3FF
+
+# Records handed to each worker per round trip; pages this size or smaller are
+# parsed in-process, since re-parsing shipped HTML costs more than it saves
+RECORD_CHUNKSIZE = 1000
+
+# Span classes picked up while tokenizing a record's child div
+FIELD_CLASSES = frozenset({'fld', 'lang-name', 'unicode'})
+
+def tokenize_div(div) -> Dict:
+    """Walk a record child div once, keeping the first node seen for each field we read"""
+    parts = {}
+    for node in div.traverse():
+        tag = node.tag
+        if tag == 'span':
+            for cls in (node.attributes.get('class') or '').split():
+                if cls in FIELD_CLASSES and cls not in parts:
+                    parts[cls] = node
+        elif tag == 'sup':
+            parts.setdefault('sup', node)
+        elif tag == 'div' and 'expandable' not in parts:
+            if 'expandable' in (node.attributes.get('class') or '').split():
+                parts['expandable'] = node
+    return parts
+
+def extract_language_entry(div, parts: Optional[Dict] = None) -> Optional[Dict]:
+    """Extract a language-specific entry with all its data"""
+    if parts is None:
+        parts = tokenize_div(div)
+    entry = {}
+
+    # Get language name and metadata from data-notes attribute
+    lang_span = parts.get('lang-name')
+    if lang_span:
+        entry['language'] = lang_span.text(strip=True)
+        lang_metadata = lang_span.attributes.get('data-notes')
+        if lang_metadata:
+            entry['language_metadata'] = lang_metadata
+
+    # Get the word/form (the unicode span content)
+    unicode_span = parts.get('unicode')
+    if unicode_span:
+        entry['form'] = unicode_span.text(strip=True)
+
+    # Get superscript number if present
+    sup = parts.get('sup')
+    if sup:
+        entry['reference_number'] = sup.text(strip=True)
+
+    # Get notes from expandable div
+    expandable = parts.get('expandable')
+    if expandable:
+        notes_div = expandable.css_first('div.notes')
+        if notes_div:
+            entry['notes'] = notes_div.text(strip=True)
+
+    return entry if entry else None
+
+def scrape_record(record_div) -> Dict:
+    """Extract all data from a single record"""
+    record = {
+        'fields': {},
+        'language_entries': []
+    }
+
+    # Process all direct child divs in the record, each is walked only once
+    for div in record_div.iter():
+        if div.tag != 'div':
+            continue
+        parts = tokenize_div(div)
+        field_span = parts.get('fld')
+        if not field_span:
+            continue
+
+        # Language entries carry a lang-name span
+        if 'lang-name' in parts:
+            lang_entry = extract_language_entry(div, parts)
+            if lang_entry:
+                record['language_entries'].append(lang_entry)
+        else:
+            # Regular field (Number, Word, etc.)
+            unicode_span = parts.get('unicode')
+            if unicode_span:
+                field_name = field_span.text(strip=True).rstrip(':')
+                record['fields'][field_name] = unicode_span.text(strip=True)
+
+    return record
+
+
+def _safe_scrape_record(record_div) -> Tuple[Optional[Dict], Optional[str]]:
+    """Scrape a record, returning the error message instead of raising so one bad record doesn't stop the batch"""
+    try:
+        return scrape_record(record_div), None
+    except Exception as e:
+        return None, str(e)
+
+def _parse_record_html(html: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """Worker entry point: re-parse one serialized record div and scrape it"""
+    from selectolax.lexbor import LexborHTMLParser
+    
+    tree = LexborHTMLParser(html)
+    return _safe_scrape_record(tree.css_first('div.results_record'))
 
-# Force UTF-8 encoding for stdout (Windows compatibility)
-if sys.stdout.encoding != 'utf-8':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 class IranianScraper:
     def __init__(self, url: str):
         self.url = url
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Created on the first scrape() so requests is only imported when needed
+        self.session: Optional['requests.Session'] = None
+    
+    def _create_session(self) -> 'requests.Session':
+        """Build the HTTP session with browser-like headers"""
+        import requests
+        
+        session = requests.Session()
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         })
+        return session
     
-    def extract_language_entry(self, div) -> Optional[Dict]:
-        """Extract a language-specific entry with all its data"""
-        if not isinstance(div, Tag):
-            return None
-            
-        entry = {}
-        
-        # Get language name and metadata from data-notes attribute
-        lang_span = div.find('span', class_='lang-name')
-        if lang_span and isinstance(lang_span, Tag):
-            entry['language'] = lang_span.get_text(strip=True)
-            lang_metadata = lang_span.get('data-notes', '')
-            if lang_metadata:
-                entry['language_metadata'] = lang_metadata
+    def scrape(self, workers: Optional[int] = None) -> List[Dict]:
+        """Scrape all records from the page
         
-        # Get the word/form (the unicode span content)
-        unicode_span = div.find('span', class_='unicode')
-        if unicode_span and isinstance(unicode_span, Tag):
-            entry['form'] = unicode_span.get_text(strip=True)
-        
-        # Get superscript number if present
-        sup = div.find('sup')
-        if sup and isinstance(sup, Tag):
-            entry['reference_number'] = sup.get_text(strip=True)
-        
-        # Get notes from expandable div
-        expandable = div.find('div', class_='expandable')
-        if expandable and isinstance(expandable, Tag):
-            notes_div = expandable.find('div', class_='notes')
-            if notes_div and isinstance(notes_div, Tag):
-                entry['notes'] = notes_div.get_text(strip=True)
-        
-        return entry if entry else None
-    
-    def scrape_record(self, record_div) -> Dict:
-        """Extract all data from a single record"""
-        record = {
-            'fields': {},
-            'language_entries': []
-        }
+        Pages larger than RECORD_CHUNKSIZE are parsed in a process pool of
+        `workers` processes (defaults to the CPU count); smaller pages, or
+        workers=1, are parsed in-process.
+        """
+        import requests
+        from selectolax.lexbor import LexborHTMLParser
         
-        # Process all divs in the record
-        for div in record_div.find_all('div', recursive=False):
-            if not isinstance(div, Tag):
-                continue
-            
-            field_span = div.find('span', class_='fld')
-            if field_span and isinstance(field_span, Tag):
-                field_name = field_span.get_text(strip=True).rstrip(':')
-                
-                # Check if this is a language entry (has lang-name span)
-                if div.find('span', class_='lang-name'):
-                    lang_entry = self.extract_language_entry(div)
-                    if lang_entry:
-                        record['language_entries'].append(lang_entry)
-                else:
-                    # Regular field (Number, Word, etc.)
-                    unicode_span = div.find('span', class_='unicode')
-                    if unicode_span and isinstance(unicode_span, Tag):
-                        record['fields'][field_name] = unicode_span.get_text(strip=True)
+        if self.session is None:
+            self.session = self._create_session()
         
-        return record
-    
-    def scrape(self) -> List[Dict]:
-        """Scrape all records from the page"""
         print(f"Fetching: {self.url}")
         
         try:
@@ -93,30 +152,38 @@ class IranianScraper:
             print(f"[ERROR] Failed to fetch URL: {e}")
             return []
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = LexborHTMLParser(response.content)
         
         # Find all records
-        record_divs = soup.find_all('div', class_='results_record')
+        record_divs = tree.css('div.results_record')
         print(f"[OK] Found {len(record_divs)} records")
         
+        if workers == 1 or len(record_divs) <= RECORD_CHUNKSIZE:
+            results = map(_safe_scrape_record, record_divs)
+        else:
+            # Nodes don't pickle, so each record is shipped as its HTML
+            htmls = [record_div.html or '' for record_div in record_divs]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_parse_record_html, htmls, chunksize=RECORD_CHUNKSIZE))
+        
         records = []
-        for i, record_div in enumerate(record_divs, 1):
-            try:
-                record_data = self.scrape_record(record_div)
-                records.append(record_data)
-                
-                # Progress update every 100 records
-                if i % 100 == 0:
-                    print(f"  ... processed {i} records")
-                    
-            except Exception as e:
-                print(f"[WARN] Error on record {i}: {e}")
+        for i, (record_data, error) in enumerate(results, 1):
+            if record_data is None:
+                print(f"[WARN] Error on record {i}: {error}")
+                continue
+            records.append(record_data)
+            
+            # Progress goes to stderr so it never interleaves with piped output
+            if i & PROGRESS_MASK == 0:
+                sys.stderr.write(f"  ... processed {i} records\n")
         
         print(f"[OK] Successfully scraped {len(records)} records")
         return records
     
     def save_to_json(self, records: List[Dict], filename: str = 'iranian_data.json'):
         """Save records to JSON file"""
+        import orjson
+        
         output = {
             'metadata': {
                 'source_url': self.url,
@@ -126,8 +193,9 @@ class IranianScraper:
             'records': records
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        # orjson emits UTF-8 bytes directly, so the file is opened in binary mode
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
         
         print(f"[OK] Saved to {filename}")
         print(f"  - Records: {output['metadata']['total_records']}")
@@ -135,6 +203,10 @@ class IranianScraper:
 
 
 if __name__ == "__main__":
+    # Force UTF-8 encoding for stdout (Windows compatibility)
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout.reconfigure(encoding='utf-8')  # type: ignore[union-attr]
+    
     URL = "https://starlingdb.org/cgi-bin/response.cgi?root=new100&basename=new100%2fier%2firn&limit=-1"
     
     scraper = IranianScraper(URL)
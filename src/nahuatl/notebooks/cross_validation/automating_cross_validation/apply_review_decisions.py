@@ -8,29 +8,181 @@ Usage:
     python apply_review_decisions.py            # Apply changes
 """
 
+import numpy as np
 import pandas as pd
 import sqlite3
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Counter, Dict, List, Tuple, Optional
 import re
+import collections
 import argparse
 
+# Prepared statements kept per connection; the default of 128 is too small once every local column has its own UPDATE
+SQLITE_CACHED_STATEMENTS = 512
+# The local table name is interpolated into SQL, so only plain identifiers are accepted
+TABLE_NAME_RE = re.compile(r'^[A-Za-z0-9_]+$')
+
+LOCAL_AUTHORITY_COLUMNS = [
+    'Alonso de Molina',
+    'Frances Karttunen',
+    'Horacio Carochi / English',
+    'Andrés de Olmos',
+    "Lockhart’s Nahuatl as Written"
+]
+
+LOCAL_ATTESTATION_COLUMNS = [
+    'Attestations from sources in English',
+    'Attestations from sources in Spanish'
+]
+
+LOCAL_UPDATE_COLUMNS = ['Principal English Translation'] + LOCAL_AUTHORITY_COLUMNS + LOCAL_ATTESTATION_COLUMNS
+
+# Scraped database statements, kept as constants so sqlite3's statement cache is hit on every call
+# Current values are read per report by joining against the report's keys loaded into REPORT_KEYS_TABLE
+REPORT_KEYS_TABLE = "temp.report_keys"
+# Row ids to delete are collected here and removed with a single DELETE per table
+DELETE_IDS_TABLE = "temp.delete_ids"
+
+SCRAPED_TRANSLATION_SELECT = f"SELECT e.node_id, e.translation_english FROM dictionary_entries e JOIN {REPORT_KEYS_TABLE} k ON e.node_id = k.key"
+SCRAPED_TRANSLATION_UPDATE = "UPDATE dictionary_entries SET translation_english = ? WHERE node_id = ?"
+
+AUTHORITY_SELECT = f"SELECT c.id, c.node_id, c.authority_name, c.citation_text FROM authority_citations c JOIN {REPORT_KEYS_TABLE} k ON c.node_id = k.key ORDER BY c.id"
+AUTHORITY_UPDATE = "UPDATE authority_citations SET citation_text = ? WHERE id = ?"
+AUTHORITY_DELETE = f"DELETE FROM authority_citations WHERE id IN (SELECT id FROM {DELETE_IDS_TABLE})"
+AUTHORITY_INSERT = "INSERT INTO authority_citations (node_id, authority_name, citation_text, citation_order) VALUES (?, ?, ?, 0)"
+
+ATTESTATION_SELECT = f"SELECT a.id, a.node_id, a.language, a.attestation_text FROM attestations a JOIN {REPORT_KEYS_TABLE} k ON a.node_id = k.key ORDER BY a.id"
+ATTESTATION_UPDATE = "UPDATE attestations SET attestation_text = ? WHERE id = ?"
+ATTESTATION_DELETE = f"DELETE FROM attestations WHERE id IN (SELECT id FROM {DELETE_IDS_TABLE})"
+ATTESTATION_INSERT = "INSERT INTO attestations (node_id, language, attestation_text, source_field) VALUES (?, ?, ?, ?)"
+
+# Scraped tables holding text rows per (node_id, authority/language), with their statements
+SCRAPED_TEXT_TABLES = {
+    'authority_citations': {
+        'select': AUTHORITY_SELECT,
+        'update': AUTHORITY_UPDATE,
+        'delete': AUTHORITY_DELETE,
+        'insert': AUTHORITY_INSERT
+    },
+    'attestations': {
+        'select': ATTESTATION_SELECT,
+        'update': ATTESTATION_UPDATE,
+        'delete': ATTESTATION_DELETE,
+        'insert': ATTESTATION_INSERT
+    }
+}
+
+# Report category -> (scraped SELECT, local columns) whose current values a report needs
+REPORT_SOURCES = {
+    'translations': (SCRAPED_TRANSLATION_SELECT, ['Principal English Translation']),
+    'authorities': (AUTHORITY_SELECT, LOCAL_AUTHORITY_COLUMNS),
+    'attestations': (ATTESTATION_SELECT, LOCAL_ATTESTATION_COLUMNS)
+}
+
+# Report category -> scraped table whose rows it rewrites through scraped_rows
+REPORT_SCRAPED_TABLES = {
+    'authorities': 'authority_citations',
+    'attestations': 'attestations'
+}
+
+# Drupal source field allowed by the attestations CHECK constraint
+ATTESTATION_SOURCE_FIELDS = {
+    'English': 'field_additionalnotes_lang1',
+    'Spanish': 'field_additionalnotes_lang2'
+}
+
+# (action, phrases that must all appear) in order of precedence, the first rule that matches wins
+DECISION_RULES = [
+    ('use_scraped_update_local', ('use scraped', 'update local')),
+    ('use_scraped_update_local', ('scraped value is the correct', 'update local')),
+    ('update_both_from_scraped', ('use scraped to update both',)),
+    ('update_both_from_scraped', ('update both', 'based off scraped')),
+    ('use_local_update_scraped', ('use local', 'update scraped')),
+    ('use_local_update_scraped', ('local value is the correct', 'update scraped')),
+    ('use_scraped_update_local', ('local value is incorrect',)),
+    ('update_both_from_local', ('update both', 'based off local')),
+    ('use_local_update_scraped', ('update local dataset value with current local',)),
+    ('delete_local', ('local will have', 'value deleted')),
+    ('delete_local', ('actual value in both is none',))
+]
+
+# One named group per rule, anchored at the start so alternatives are tried in rule order;
+# lookaheads let the phrases of a rule appear in any order
+DECISION_RE = re.compile(
+    '^(?:' + '|'.join(
+        f'(?P<rule{i}>' + ''.join(f'(?=.*{re.escape(phrase)})' for phrase in phrases) + ')'
+        for i, (_, phrases) in enumerate(DECISION_RULES)
+    ) + ')',
+    re.DOTALL
+)
+
+CHANGES_LOG_COLUMNS = ['database', 'table', 'node_id', 'field', 'old_value', 'new_value']
+# Above this many entries the 'auto' log format switches from CSV to Parquet
+PARQUET_LOG_THRESHOLD = 10_000
+
+SPANISH_CHECK_RE = re.compile('spanish attestation|spanish one')
+
+def classify_decisions(decisions: pd.Series, unrecognized: Optional[Counter[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalize a whole Decision column to standard actions with one regex pass per row.
+    Non-empty decisions matching no rule become 'skip' and are counted in `unrecognized`.
+    Returns: (actions, check_spanish_attestation), one entry per row
+    
+    Possible actions:
+    - 'use_scraped_update_local'
+    - 'use_local_update_scraped'
+    - 'update_both_from_scraped'
+    - 'update_both_from_local'
+    - 'delete_local'
+    - 'skip'
+    """
+    d = decisions.fillna('').astype(str).str.lower().str.strip()
+    
+    empty = (d == '').to_numpy()
+    check_spanish = d.str.contains(SPANISH_CHECK_RE).to_numpy() & ~empty
+    
+    # Matched groups capture '' and unmatched ones NaN, argmax finds the first matching rule
+    matches = d.str.extract(DECISION_RE).notna().to_numpy()
+    rule_actions = np.array([action for action, _ in DECISION_RULES])
+    actions = np.where(matches.any(axis=1), rule_actions[matches.argmax(axis=1)], 'skip')
+    
+    if unrecognized is not None:
+        unrecognized.update(decisions[~matches.any(axis=1) & ~empty].tolist())
+    
+    return actions, check_spanish
+
 class ReviewDecisionApplicator:
     def __init__(
         self,
         scraped_db_path: str,
         local_db_path: str,
         local_table: str,
-        dry_run: bool = True
+        dry_run: bool = True,
+        fsync: str = 'normal',
+        checkpoint_mode: str = 'file',
+        log_format: str = 'auto',
+        log_overrides: bool = False
     ):
         self.scraped_db_path = Path(scraped_db_path)
         self.local_db_path = Path(local_db_path)
+        if not TABLE_NAME_RE.match(local_table):
+            raise ValueError(f"Invalid local table name: {local_table!r}")
         self.local_table = local_table
+        self.quoted_local_table = f'[{local_table}]'
         self.dry_run = dry_run
+        self.fsync = fsync
+        self.checkpoint_mode = checkpoint_mode
+        self.log_format = log_format
+        self.log_overrides = log_overrides
         
+        # Writes go through scraped_conn/local_conn on the main thread, the read
+        # connections load the next report's current values from a worker thread
         self.scraped_conn = None
         self.local_conn = None
+        self.scraped_read_conn = None
+        self.local_read_conn = None
         
         self.stats = {
             'translations': {'scraped': 0, 'local': 0, 'both': 0, 'deleted': 0, 'skipped': 0},
@@ -45,19 +197,75 @@ class ReviewDecisionApplicator:
             'Andrés de Olmos': 'Olmos',
             "Lockhart’s Nahuatl as Written": 'Lockhart'
         }
+        # Scraped authority name -> local column name
+        self.authority_mapping_inverse = {v: k for k, v in self.authority_mapping.items()}
         
-        self.changes_log = []
+        # Local UPDATE statements depend on the table name, so they are built once per column here
+        self.local_update_sql = {
+            column: f'UPDATE {self.quoted_local_table} SET "{column}" = ? WHERE Ref = ?'
+            for column in LOCAL_UPDATE_COLUMNS
+        }
+        
+        # Tuples in CHANGES_LOG_COLUMNS order
+        self.changes_log: List[Tuple] = []
+        # (database, table, node_id, field) -> changes_log index of its entry in the current report
+        self.report_log_index: Dict[Tuple, int] = {}
         self.spanish_attestation_notes = []
+        self.unknown_decisions: Counter[str] = collections.Counter()
+        
+        # Current values, fetched in bulk per report and kept in sync with queued writes
+        self.scraped_translations: Dict[str, Optional[str]] = {}
+        self.local_values: Dict[str, Dict[str, Optional[str]]] = {}
+        # table -> (node_id, authority/language) -> [[id, text], ...] in id order, id None for pending inserts
+        self.scraped_rows: Dict[str, Dict[Tuple[str, str], List[list]]] = {}
+        
+        # Pending writes per database: SQL -> target key -> parameters, last write per key wins
+        self.scraped_batch: Dict[str, Dict[str, Tuple]] = {}
+        self.local_batch: Dict[str, Dict[str, Tuple]] = {}
+        # table -> {'update': {id: text}, 'delete': [id], 'insert': {(node_id, key): params}}
+        self.scraped_changes: Dict[str, Dict] = {}
         
     def connect(self):
         """Establish database connections"""
         print("Connecting to databases...")
-        self.scraped_conn = sqlite3.connect(self.scraped_db_path)
-        self.local_conn = sqlite3.connect(self.local_db_path)
+        self.scraped_conn = sqlite3.connect(self.scraped_db_path, cached_statements=SQLITE_CACHED_STATEMENTS)
+        self.local_conn = sqlite3.connect(self.local_db_path, cached_statements=SQLITE_CACHED_STATEMENTS)
         
+        for conn in (self.scraped_conn, self.local_conn):
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -64000")
+            conn.execute("PRAGMA busy_timeout = 5000")
+            
+            # journal_mode is persisted in the db file, so only switch it when applying
+            if not self.dry_run:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute(f"PRAGMA synchronous = {'FULL' if self.fsync == 'full' else 'NORMAL'}")
+                conn.execute("PRAGMA foreign_keys = ON")
+        
+        # Checkpoint tables are created with CREATE TABLE AS, so they carry no index on
+        # Ref and every local UPDATE would scan the table. Scraped lookups already use
+        # the node_id indexes from schema.sql. Indexes change the file, so only when applying
         if not self.dry_run:
-            self.scraped_conn.execute("PRAGMA foreign_keys = ON")
-            self.local_conn.execute("PRAGMA foreign_keys = ON")
+            with self.local_conn:
+                self.local_conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS [idx_{self.local_table}_ref] ON {self.quoted_local_table} (Ref)'
+                )
+        
+        # Opened after WAL is enabled, so reads don't block on the report being written
+        self.scraped_read_conn = sqlite3.connect(
+            self.scraped_db_path,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+            check_same_thread=False
+        )
+        self.local_read_conn = sqlite3.connect(
+            self.local_db_path,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+            check_same_thread=False
+        )
+        for conn in (self.scraped_read_conn, self.local_read_conn):
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -64000")
+            conn.execute("PRAGMA busy_timeout = 5000")
         
         print(f" Scraped DB: {self.scraped_db_path}")
         print(f" Local DB: {self.local_db_path}")
@@ -65,87 +273,227 @@ class ReviewDecisionApplicator:
         
     def close(self):
         """Close database connections"""
-        if self.scraped_conn:
-            self.scraped_conn.close()
-        if self.local_conn:
-            self.local_conn.close()
+        for conn in (self.scraped_conn, self.local_conn, self.scraped_read_conn, self.local_read_conn):
+            if conn:
+                conn.close()
             
-    def normalize_decision(self, decision: str) -> Tuple[str, bool]:
+    def fetch_for_keys(self, conn: sqlite3.Connection, query: str, keys: List[str]) -> List[Tuple]:
+        """Load keys into the connection's temp key table and run one query joining against it"""
+        # Committed straight away so no transaction is left open ahead of the report's writes
+        with conn:
+            # Untyped key column, so the joined column's affinity decides how keys compare
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {REPORT_KEYS_TABLE} (key PRIMARY KEY)")
+            conn.execute(f"DELETE FROM {REPORT_KEYS_TABLE}")
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {REPORT_KEYS_TABLE} VALUES (?)",
+                ((key,) for key in keys)
+            )
+            return conn.execute(query).fetchall()
+    
+    def read_report(self, report_path: str) -> pd.DataFrame:
+        """Load a review report with pyarrow's multi-threaded CSV parser"""
+        df = pd.read_csv(report_path, encoding='utf-8-sig', engine='pyarrow')
+        # The pyarrow engine leaves empty text cells as None, keep the C parser's NaN
+        return df.fillna(np.nan)
+    
+    def report_column(self, df: pd.DataFrame, column: str, default='') -> list:
+        """Column values as plain Python objects, or `default` for every row if the report lacks it"""
+        if column in df.columns:
+            return df[column].tolist()
+        return [default] * len(df)
+    
+    def load_report(self, category: str, report_path: str) -> Optional[Tuple[pd.DataFrame, List[str], List[Tuple], List[Tuple]]]:
         """
-        Normalize decision string to standard action.
-        Returns: (action, check_spanish_attestation)
-        
-        Possible actions:
-        - 'use_scraped_update_local'
-        - 'use_local_update_scraped'
-        - 'update_both_from_scraped'
-        - 'update_both_from_local'
-        - 'delete_local'
-        - 'skip'
+        Read a report and the current scraped/local rows it touches on the read connections.
+        Touches no shared state, so it can run in a worker thread while another report is written.
+        Returns: (df, node_ids, scraped_rows, local_rows), or None if the report doesn't exist
         """
-        if pd.isna(decision) or decision.strip() == "":
-            return 'skip', False
-            
-        decision_lower = decision.lower().strip()
-        check_spanish = 'spanish attestation' in decision_lower or 'spanish one' in decision_lower
-        
-        if 'use scraped' in decision_lower and 'update local' in decision_lower:
-            return 'use_scraped_update_local', check_spanish
-        elif 'scraped value is the correct' in decision_lower and 'update local' in decision_lower:
-            return 'use_scraped_update_local', check_spanish
-        elif 'use scraped to update both' in decision_lower:
-            return 'update_both_from_scraped', check_spanish
-        elif 'update both' in decision_lower and 'based off scraped' in decision_lower:
-            return 'update_both_from_scraped', check_spanish
-            
-        elif 'use local' in decision_lower and 'update scraped' in decision_lower:
-            return 'use_local_update_scraped', check_spanish
-        elif 'local value is the correct' in decision_lower and 'update scraped' in decision_lower:
-            return 'use_local_update_scraped', check_spanish
-        elif 'local value is incorrect' in decision_lower:
-            return 'use_scraped_update_local', check_spanish
-        elif 'update both' in decision_lower and 'based off local' in decision_lower:
-            return 'update_both_from_local', check_spanish
-        elif 'update local dataset value with current local' in decision_lower:
-            return 'use_local_update_scraped', check_spanish
-            
-        elif 'local will have' in decision_lower and 'value deleted' in decision_lower:
-            return 'delete_local', check_spanish
-        elif 'actual value in both is none' in decision_lower:
-            return 'delete_local', check_spanish
-            
+        try:
+            df = self.read_report(report_path)
+        except FileNotFoundError:
+            return None
+        if 'Decision' not in df.columns:
+            return df, [], [], []
+        
+        scraped_select, local_columns = REPORT_SOURCES[category]
+        node_ids = df['node_id'].astype(str).tolist()
+        quoted = ', '.join(f'"{column}"' for column in local_columns)
+        
+        scraped_rows = self.fetch_for_keys(
+            self.scraped_read_conn, # type: ignore
+            scraped_select,
+            node_ids
+        )
+        local_rows = self.fetch_for_keys(
+            self.local_read_conn, # type: ignore
+            f'SELECT t.Ref, {quoted} FROM {self.quoted_local_table} t JOIN {REPORT_KEYS_TABLE} k ON t.Ref = k.key',
+            [f"WHP-{node_id}" for node_id in node_ids]
+        )
+        return df, node_ids, scraped_rows, local_rows
+    
+    def index_scraped_translations(self, rows: List[Tuple]):
+        """Keep the current scraped translations of a report by node_id"""
+        for node_id, value in rows:
+            self.scraped_translations[str(node_id)] = value
+    
+    def index_local_values(self, rows: List[Tuple], columns: List[str]):
+        """Keep the given current local columns of a report by Ref"""
+        for ref_value, *values in rows:
+            self.local_values.setdefault(ref_value, {}).update(zip(columns, values))
+    
+    def index_scraped_rows(self, table: str, rows: List[Tuple]):
+        """Index the existing citation/attestation rows of a report by (node_id, key)"""
+        current: Dict[Tuple[str, str], List[list]] = {}
+        for row_id, node_id, key, text in rows:
+            current.setdefault((str(node_id), key), []).append([row_id, text])
+        self.scraped_rows[table] = current
+        self.scraped_changes[table] = {'update': {}, 'delete': [], 'insert': {}}
+    
+    def insert_params(self, table: str, node_id: str, key: str, new_value: str) -> Tuple:
+        """Parameters for a new citation/attestation row"""
+        if table == 'attestations':
+            return (node_id, key, new_value, ATTESTATION_SOURCE_FIELDS.get(key))
+        return (node_id, key, new_value)
+    
+    def queue_scraped_write(self, table: str, node_id: str, key: str, new_value: str) -> Optional[str]:
+        """
+        Queue an update, delete (empty new value) or insert (no existing row) against
+        the first row for (node_id, key), returning the value it replaces
+        """
+        rows = self.scraped_rows[table].setdefault((node_id, key), [])
+        changes = self.scraped_changes[table]
+        keep = bool(new_value and new_value.strip())
+        
+        if rows:
+            row = rows[0]
+            row_id, old_value = row
+            if keep:
+                row[1] = new_value
+                if row_id is None:
+                    changes['insert'][(node_id, key)] = self.insert_params(table, node_id, key, new_value)
+                else:
+                    changes['update'][row_id] = new_value
+            else:
+                rows.pop(0)
+                if row_id is None:
+                    del changes['insert'][(node_id, key)]
+                else:
+                    changes['update'].pop(row_id, None)
+                    changes['delete'].append(row_id)
         else:
-            print(f"  WARNING: Unrecognized decision: '{decision}'")
-            return 'skip', check_spanish
+            old_value = None
+            if keep:
+                rows.append([None, new_value])
+                changes['insert'][(node_id, key)] = self.insert_params(table, node_id, key, new_value)
+        
+        return old_value
+    
+    def queue_local_update(self, node_id: str, column_name: str, new_value: str) -> Optional[str]:
+        """Queue an update of one local column, returning the value it replaces"""
+        ref_value = f"WHP-{node_id}"
+        current = self.local_values.setdefault(ref_value, {})
+        old_value = current.get(column_name)
+        current[column_name] = new_value
+        
+        self.local_batch.setdefault(self.local_update_sql[column_name], {})[ref_value] = (new_value, ref_value)
+        return old_value
+    
+    def bulk_delete(self, delete_sql: str, row_ids: List[int]):
+        """Stage row ids in the temp delete table and remove them with one DELETE"""
+        conn = self.scraped_conn
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {DELETE_IDS_TABLE} (id INTEGER PRIMARY KEY)") # type: ignore
+        conn.executemany(f"INSERT OR IGNORE INTO {DELETE_IDS_TABLE} VALUES (?)", ((row_id,) for row_id in row_ids)) # type: ignore
+        conn.execute(delete_sql) # type: ignore
+        conn.execute(f"DELETE FROM {DELETE_IDS_TABLE}") # type: ignore
+    
+    def flush_updates(self):
+        """Apply the queued writes with one executemany per statement, inside the report transaction"""
+        try:
+            if not self.dry_run:
+                for table, changes in self.scraped_changes.items():
+                    sql = SCRAPED_TEXT_TABLES[table]
+                    if changes['delete']:
+                        self.bulk_delete(sql['delete'], changes['delete'])
+                    self.scraped_conn.executemany(sql['update'], [(text, row_id) for row_id, text in changes['update'].items()]) # type: ignore
+                    self.scraped_conn.executemany(sql['insert'], changes['insert'].values()) # type: ignore
+        finally:
+            self.scraped_changes.clear()
+        
+        for conn, batch in (
+            (self.scraped_conn, self.scraped_batch),
+            (self.local_conn, self.local_batch)
+        ):
+            try:
+                if not self.dry_run:
+                    for sql, params in batch.items():
+                        conn.executemany(sql, params.values()) # type: ignore
+            finally:
+                batch.clear()
+        
+        self.report_log_index.clear()
+    
+    def snapshot_report(self, category: str) -> Tuple[int, Dict[str, int], Dict[Tuple, int]]:
+        """Bookkeeping to restore if the report's transaction is rolled back"""
+        return len(self.changes_log), dict(self.stats[category]), dict(self.report_log_index)
+    
+    def discard_report(self, category: str, node_ids: List[str], snapshot: Tuple[int, Dict[str, int], Dict[Tuple, int]]) -> int:
+        """
+        Undo the bookkeeping of a rolled back report: its change log entries, stats and
+        pending writes, and the cached values it touched, which no longer match the databases.
+        Returns the number of change log entries discarded
+        """
+        log_length, stats, log_index = snapshot
+        discarded = len(self.changes_log) - log_length
+        del self.changes_log[log_length:]
+        self.stats[category] = stats
+        self.report_log_index = log_index
+        
+        self.scraped_batch.clear()
+        self.local_batch.clear()
+        self.scraped_changes.clear()
+        
+        for node_id in node_ids:
+            self.local_values.pop(f"WHP-{node_id}", None)
+        if category == 'translations':
+            for node_id in node_ids:
+                self.scraped_translations.pop(node_id, None)
+        else:
+            self.scraped_rows.pop(REPORT_SCRAPED_TABLES[category], None)
+        
+        return discarded
+    
+    def log_change(self, database: str, table: str, node_id: str, field: str, old_value, new_value):
+        """
+        Record a change. A field written again in the same report only keeps its final
+        value (against the report's original old value) unless overrides are logged
+        """
+        key = (database, table, node_id, field)
+        index = self.report_log_index.get(key)
+        
+        if index is not None and not self.log_overrides:
+            old_value = self.changes_log[index][4]
+            self.changes_log[index] = (database, table, node_id, field, old_value, new_value)
+            return
+        
+        self.report_log_index[key] = len(self.changes_log)
+        self.changes_log.append((database, table, node_id, field, old_value, new_value))
     
     def update_scraped_translation(self, node_id: str, new_value: str) -> bool:
-        """Update translation in scraped database"""
+        """Queue a translation update for the scraped database"""
         try:
-            cursor = self.scraped_conn.cursor() # type: ignore
-            
-            old_value = cursor.execute(
-                "SELECT translation_english FROM dictionary_entries WHERE node_id = ?",
-                (node_id,)
-            ).fetchone()
+            old_value = self.scraped_translations.get(node_id)
+            self.scraped_translations[node_id] = new_value
             
-            if old_value:
-                old_value = old_value[0]
-            
-            if not self.dry_run:
-                cursor.execute(
-                    "UPDATE dictionary_entries SET translation_english = ? WHERE node_id = ?",
-                    (new_value, node_id)
-                )
-                self.scraped_conn.commit() # pyright: ignore[reportOptionalMemberAccess]
+            self.scraped_batch.setdefault(SCRAPED_TRANSLATION_UPDATE, {})[node_id] = (new_value, node_id)
             
-            self.changes_log.append({
-                'database': 'scraped',
-                'table': 'dictionary_entries',
-                'node_id': node_id,
-                'field': 'translation_english',
-                'old_value': old_value,
-                'new_value': new_value
-            })
+            self.log_change(
+                'scraped',
+                'dictionary_entries',
+                node_id,
+                'translation_english',
+                old_value,
+                new_value
+            )
             
             return True
         except Exception as e:
@@ -153,35 +501,18 @@ class ReviewDecisionApplicator:
             return False
     
     def update_local_translation(self, node_id: str, new_value: str) -> bool:
-        """Update translation in local database checkpoint table"""
+        """Queue a translation update for the local database checkpoint table"""
         try:
-            cursor = self.local_conn.cursor() # type: ignore
-            
-            ref_value = f"WHP-{node_id}"
-            
-            old_value = cursor.execute(
-                f'SELECT "Principal English Translation" FROM [{self.local_table}] WHERE Ref = ?',
-                (ref_value,)
-            ).fetchone()
+            old_value = self.queue_local_update(node_id, 'Principal English Translation', new_value)
             
-            if old_value:
-                old_value = old_value[0]
-            
-            if not self.dry_run:
-                cursor.execute(
-                    f'UPDATE [{self.local_table}] SET "Principal English Translation" = ? WHERE Ref = ?',
-                    (new_value, ref_value)
-                )
-                self.local_conn.commit()
-            
-            self.changes_log.append({
-                'database': 'local',
-                'table': self.local_table,
-                'node_id': node_id,
-                'field': 'Principal English Translation',
-                'old_value': old_value,
-                'new_value': new_value
-            })
+            self.log_change(
+                'local',
+                self.local_table,
+                node_id,
+                'Principal English Translation',
+                old_value,
+                new_value
+            )
             
             return True
         except Exception as e:
@@ -189,46 +520,18 @@ class ReviewDecisionApplicator:
             return False
     
     def update_scraped_authority(self, node_id: str, authority: str, new_value: str) -> bool:
-        """Update authority citation in scraped database"""
+        """Queue an authority citation change for the scraped database"""
         try:
-            cursor = self.scraped_conn.cursor() # type: ignore
-            
-            existing = cursor.execute(
-                "SELECT id, citation_text FROM authority_citations WHERE node_id = ? AND authority_name = ?",
-                (node_id, authority)
-            ).fetchone()
-            
-            if existing:
-                citation_id, old_value = existing
-                if not self.dry_run:
-                    if new_value and new_value.strip():
-                        cursor.execute(
-                            "UPDATE authority_citations SET citation_text = ? WHERE id = ?",
-                            (new_value, citation_id)
-                        )
-                    else:
-                        cursor.execute(
-                            "DELETE FROM authority_citations WHERE id = ?",
-                            (citation_id,)
-                        )
-                    self.scraped_conn.commit()
-            else:
-                old_value = None
-                if new_value and new_value.strip() and not self.dry_run:
-                    cursor.execute(
-                        "INSERT INTO authority_citations (node_id, authority_name, citation_text, citation_order) VALUES (?, ?, ?, 0)",
-                        (node_id, authority, new_value)
-                    )
-                    self.scraped_conn.commit()
+            old_value = self.queue_scraped_write('authority_citations', node_id, authority, new_value)
             
-            self.changes_log.append({
-                'database': 'scraped',
-                'table': 'authority_citations',
-                'node_id': node_id,
-                'field': f'authority_{authority}',
-                'old_value': old_value,
-                'new_value': new_value
-            })
+            self.log_change(
+                'scraped',
+                'authority_citations',
+                node_id,
+                f'authority_{authority}',
+                old_value,
+                new_value
+            )
             
             return True
         except Exception as e:
@@ -236,35 +539,18 @@ class ReviewDecisionApplicator:
             return False
     
     def update_local_authority(self, node_id: str, authority_local_name: str, new_value: str) -> bool:
-        """Update authority citation in local database checkpoint table"""
+        """Queue an authority citation update for the local database checkpoint table"""
         try:
-            cursor = self.local_conn.cursor()
-            
-            ref_value = f"WHP-{node_id}"
-            
-            old_value = cursor.execute(
-                f'SELECT "{authority_local_name}" FROM [{self.local_table}] WHERE Ref = ?',
-                (ref_value,)
-            ).fetchone()
-            
-            if old_value:
-                old_value = old_value[0]
-            
-            if not self.dry_run:
-                cursor.execute(
-                    f'UPDATE [{self.local_table}] SET "{authority_local_name}" = ? WHERE Ref = ?',
-                    (new_value, ref_value)
-                )
-                self.local_conn.commit()
+            old_value = self.queue_local_update(node_id, authority_local_name, new_value)
             
-            self.changes_log.append({
-                'database': 'local',
-                'table': self.local_table,
-                'node_id': node_id,
-                'field': authority_local_name,
-                'old_value': old_value,
-                'new_value': new_value
-            })
+            self.log_change(
+                'local',
+                self.local_table,
+                node_id,
+                authority_local_name,
+                old_value,
+                new_value
+            )
             
             return True
         except Exception as e:
@@ -272,46 +558,18 @@ class ReviewDecisionApplicator:
             return False
     
     def update_scraped_attestation(self, node_id: str, language: str, new_value: str) -> bool:
-        """Update attestation in scraped database"""
+        """Queue an attestation change for the scraped database"""
         try:
-            cursor = self.scraped_conn.cursor()
-            
-            existing = cursor.execute(
-                "SELECT id, attestation_text FROM attestations WHERE node_id = ? AND language = ?",
-                (node_id, language)
-            ).fetchone()
-            
-            if existing:
-                attestation_id, old_value = existing
-                if not self.dry_run:
-                    if new_value and new_value.strip():
-                        cursor.execute(
-                            "UPDATE attestations SET attestation_text = ? WHERE id = ?",
-                            (new_value, attestation_id)
-                        )
-                    else:
-                        cursor.execute(
-                            "DELETE FROM attestations WHERE id = ?",
-                            (attestation_id,)
-                        )
-                    self.scraped_conn.commit()
-            else:
-                old_value = None
-                if new_value and new_value.strip() and not self.dry_run:
-                    cursor.execute(
-                        "INSERT INTO attestations (node_id, language, attestation_text, source_field) VALUES (?, ?, ?, ?)",
-                        (node_id, language, new_value, f'field_attestation_{language.lower()}')
-                    )
-                    self.scraped_conn.commit()
+            old_value = self.queue_scraped_write('attestations', node_id, language, new_value)
             
-            self.changes_log.append({
-                'database': 'scraped',
-                'table': 'attestations',
-                'node_id': node_id,
-                'field': f'attestation_{language}',
-                'old_value': old_value,
-                'new_value': new_value
-            })
+            self.log_change(
+                'scraped',
+                'attestations',
+                node_id,
+                f'attestation_{language}',
+                old_value,
+                new_value
+            )
             
             return True
         except Exception as e:
@@ -319,53 +577,46 @@ class ReviewDecisionApplicator:
             return False
     
     def update_local_attestation(self, node_id: str, language: str, new_value: str) -> bool:
-        """Update attestation in local database checkpoint table"""
+        """Queue an attestation update for the local database checkpoint table"""
         try:
-            cursor = self.local_conn.cursor()
-            
-            ref_value = f"WHP-{node_id}"
             column_name = f"Attestations from sources in {language}"
+            old_value = self.queue_local_update(node_id, column_name, new_value)
             
-            old_value = cursor.execute(
-                f'SELECT "{column_name}" FROM [{self.local_table}] WHERE Ref = ?',
-                (ref_value,)
-            ).fetchone()
-            
-            if old_value:
-                old_value = old_value[0]
-            
-            if not self.dry_run:
-                cursor.execute(
-                    f'UPDATE [{self.local_table}] SET "{column_name}" = ? WHERE Ref = ?',
-                    (new_value, ref_value)
-                )
-                self.local_conn.commit()
-            
-            self.changes_log.append({
-                'database': 'local',
-                'table': self.local_table,
-                'node_id': node_id,
-                'field': column_name,
-                'old_value': old_value,
-                'new_value': new_value
-            })
+            self.log_change(
+                'local',
+                self.local_table,
+                node_id,
+                column_name,
+                old_value,
+                new_value
+            )
             
             return True
         except Exception as e:
             print(f"  ERROR updating local attestation {language} for node {node_id}: {e}")
             return False
     
-    def process_translations(self, report_path: str):
-        """Process translation mismatch report"""
+    def report_unknown_decisions(self, unknown_decisions: Counter[str]):
+        """Print one summary line for a report's unrecognized decisions and add them to the run total"""
+        if not unknown_decisions:
+            return
+        
+        self.unknown_decisions.update(unknown_decisions)
+        print(f"  WARNING: {sum(unknown_decisions.values())} unrecognized decisions skipped "
+              f"({len(unknown_decisions)} variants), top 5: {unknown_decisions.most_common(5)}")
+    
+    def process_translations(self, report_path: str, loaded: Optional[Future] = None):
+        """Process translation mismatch report, optionally already being loaded by `load_report`"""
         print("\n" + "="*80)
         print("PROCESSING TRANSLATION MISMATCHES")
         print("="*80)
         
-        if not Path(report_path).exists():
+        report = loaded.result() if loaded else self.load_report('translations', report_path)
+        if report is None:
             print(f"  WARNING: Report not found: {report_path}")
             return
         
-        df = pd.read_csv(report_path, encoding='utf-8-sig')
+        df, node_ids, scraped_rows, local_rows = report
         
         if 'Decision' not in df.columns:
             print("  ERROR: 'Decision' column not found in report")
@@ -373,55 +624,75 @@ class ReviewDecisionApplicator:
         
         print(f"  Loaded {len(df)} translation mismatches")
         
-        for idx, row in df.iterrows():
-            node_id = str(row['node_id'])
-            scraped_val = row['scraped_translation_clean']
-            local_val = row['local_translation_clean']
-            decision = row['Decision']
-            
-            action, check_spanish = self.normalize_decision(decision)
-            
-            if check_spanish:
-                self.spanish_attestation_notes.append({
-                    'node_id': node_id,
-                    'headword': row.get('headword', ''),
-                    'field_type': 'translation',
-                    'note': decision
-                })
-            
-            if action == 'skip':
-                self.stats['translations']['skipped'] += 1
-                continue
-            
-            if action == 'use_scraped_update_local':
-                if self.update_local_translation(node_id, scraped_val):
-                    self.stats['translations']['local'] += 1
-                    
-            elif action == 'use_local_update_scraped':
-                if self.update_scraped_translation(node_id, local_val):
-                    self.stats['translations']['scraped'] += 1
+        self.index_scraped_translations(scraped_rows)
+        self.index_local_values(local_rows, REPORT_SOURCES['translations'][1])
+        
+        unknown_decisions: Counter[str] = collections.Counter()
+        snapshot = self.snapshot_report('translations')
+        
+        # One transaction per database for the whole report: committed on
+        # success, rolled back together if anything in the report fails
+        try:
+            with self.scraped_conn, self.local_conn: # type: ignore
+                rows = zip(
+                    node_ids,
+                    df['scraped_translation_clean'].tolist(),
+                    df['local_translation_clean'].tolist(),
+                    df['Decision'].tolist(),
+                    self.report_column(df, 'headword'),
+                    *classify_decisions(df['Decision'], unknown_decisions)
+                )
+                for node_id, scraped_val, local_val, decision, headword, action, check_spanish in rows:
                     
-            elif action == 'update_both_from_scraped':
-                success = True
-                if not self.update_scraped_translation(node_id, scraped_val):
-                    success = False
-                if not self.update_local_translation(node_id, scraped_val):
-                    success = False
-                if success:
-                    self.stats['translations']['both'] += 1
+                    if check_spanish:
+                        self.spanish_attestation_notes.append({
+                            'node_id': node_id,
+                            'headword': headword,
+                            'field_type': 'translation',
+                            'note': decision
+                        })
                     
-            elif action == 'update_both_from_local':
-                success = True
-                if not self.update_scraped_translation(node_id, local_val):
-                    success = False
-                if not self.update_local_translation(node_id, local_val):
-                    success = False
-                if success:
-                    self.stats['translations']['both'] += 1
+                    if action == 'skip':
+                        self.stats['translations']['skipped'] += 1
+                        continue
                     
-            elif action == 'delete_local':
-                if self.update_local_translation(node_id, ''):
-                    self.stats['translations']['deleted'] += 1
+                    if action == 'use_scraped_update_local':
+                        if self.update_local_translation(node_id, scraped_val):
+                            self.stats['translations']['local'] += 1
+                            
+                    elif action == 'use_local_update_scraped':
+                        if self.update_scraped_translation(node_id, local_val):
+                            self.stats['translations']['scraped'] += 1
+                            
+                    elif action == 'update_both_from_scraped':
+                        success = True
+                        if not self.update_scraped_translation(node_id, scraped_val):
+                            success = False
+                        if not self.update_local_translation(node_id, scraped_val):
+                            success = False
+                        if success:
+                            self.stats['translations']['both'] += 1
+                            
+                    elif action == 'update_both_from_local':
+                        success = True
+                        if not self.update_scraped_translation(node_id, local_val):
+                            success = False
+                        if not self.update_local_translation(node_id, local_val):
+                            success = False
+                        if success:
+                            self.stats['translations']['both'] += 1
+                            
+                    elif action == 'delete_local':
+                        if self.update_local_translation(node_id, ''):
+                            self.stats['translations']['deleted'] += 1
+                
+                self.flush_updates()
+        except sqlite3.Error as e:
+            print(f"  ERROR applying translation updates, rolled back: {e}")
+            discarded = self.discard_report('translations', node_ids, snapshot)
+            print(f"  Discarded {discarded} logged changes from this report")
+        
+        self.report_unknown_decisions(unknown_decisions)
         
         print(f"\n  Translation updates:")
         print(f"    Scraped DB updated: {self.stats['translations']['scraped']}")
@@ -430,17 +701,18 @@ class ReviewDecisionApplicator:
         print(f"    Local deleted: {self.stats['translations']['deleted']}")
         print(f"    Skipped: {self.stats['translations']['skipped']}")
     
-    def process_authorities(self, report_path: str):
-        """Process authority citation mismatch report"""
+    def process_authorities(self, report_path: str, loaded: Optional[Future] = None):
+        """Process authority citation mismatch report, optionally already being loaded by `load_report`"""
         print("\n" + "="*80)
         print("PROCESSING AUTHORITY CITATION MISMATCHES")
         print("="*80)
         
-        if not Path(report_path).exists():
+        report = loaded.result() if loaded else self.load_report('authorities', report_path)
+        if report is None:
             print(f"  WARNING: Report not found: {report_path}")
             return
         
-        df = pd.read_csv(report_path, encoding='utf-8-sig')
+        df, node_ids, scraped_rows, local_rows = report
         
         if 'Decision' not in df.columns:
             print("  ERROR: 'Decision' column not found in report")
@@ -448,62 +720,81 @@ class ReviewDecisionApplicator:
         
         print(f"  Loaded {len(df)} authority citation mismatches")
         
-        for idx, row in df.iterrows():
-            node_id = str(row['node_id'])
-            authority_scraped = row['authority']
-            scraped_val = row['scraped_value']
-            local_val = row['local_value']
-            decision = row['Decision']
-            
-            authority_local_name = [k for k, v in self.authority_mapping.items() if v == authority_scraped]
-            if not authority_local_name:
-                print(f"  WARNING: Unknown authority {authority_scraped} for node {node_id}")
-                continue
-            authority_local_name = authority_local_name[0]
-            
-            action, check_spanish = self.normalize_decision(decision)
-            
-            if check_spanish:
-                self.spanish_attestation_notes.append({
-                    'node_id': node_id,
-                    'headword': row.get('headword', ''),
-                    'field_type': f'authority_{authority_scraped}',
-                    'note': decision
-                })
-            
-            if action == 'skip':
-                self.stats['authorities']['skipped'] += 1
-                continue
-            
-            if action == 'use_scraped_update_local':
-                if self.update_local_authority(node_id, authority_local_name, scraped_val):
-                    self.stats['authorities']['local'] += 1
+        self.index_scraped_rows('authority_citations', scraped_rows)
+        self.index_local_values(local_rows, LOCAL_AUTHORITY_COLUMNS)
+        
+        unknown_decisions: Counter[str] = collections.Counter()
+        snapshot = self.snapshot_report('authorities')
+        
+        # One transaction per database for the whole report: committed on
+        # success, rolled back together if anything in the report fails
+        try:
+            with self.scraped_conn, self.local_conn: # type: ignore
+                rows = zip(
+                    node_ids,
+                    df['authority'].tolist(),
+                    df['scraped_value'].tolist(),
+                    df['local_value'].tolist(),
+                    df['Decision'].tolist(),
+                    self.report_column(df, 'headword'),
+                    *classify_decisions(df['Decision'], unknown_decisions)
+                )
+                for node_id, authority_scraped, scraped_val, local_val, decision, headword, action, check_spanish in rows:
                     
-            elif action == 'use_local_update_scraped':
-                if self.update_scraped_authority(node_id, authority_scraped, local_val):
-                    self.stats['authorities']['scraped'] += 1
+                    authority_local_name = self.authority_mapping_inverse.get(authority_scraped)
+                    if authority_local_name is None:
+                        print(f"  WARNING: Unknown authority {authority_scraped} for node {node_id}")
+                        continue
                     
-            elif action == 'update_both_from_scraped':
-                success = True
-                if not self.update_scraped_authority(node_id, authority_scraped, scraped_val):
-                    success = False
-                if not self.update_local_authority(node_id, authority_local_name, scraped_val):
-                    success = False
-                if success:
-                    self.stats['authorities']['both'] += 1
+                    if check_spanish:
+                        self.spanish_attestation_notes.append({
+                            'node_id': node_id,
+                            'headword': headword,
+                            'field_type': f'authority_{authority_scraped}',
+                            'note': decision
+                        })
                     
-            elif action == 'update_both_from_local':
-                success = True
-                if not self.update_scraped_authority(node_id, authority_scraped, local_val):
-                    success = False
-                if not self.update_local_authority(node_id, authority_local_name, local_val):
-                    success = False
-                if success:
-                    self.stats['authorities']['both'] += 1
+                    if action == 'skip':
+                        self.stats['authorities']['skipped'] += 1
+                        continue
                     
-            elif action == 'delete_local':
-                if self.update_local_authority(node_id, authority_local_name, ''):
-                    self.stats['authorities']['deleted'] += 1
+                    if action == 'use_scraped_update_local':
+                        if self.update_local_authority(node_id, authority_local_name, scraped_val):
+                            self.stats['authorities']['local'] += 1
+                            
+                    elif action == 'use_local_update_scraped':
+                        if self.update_scraped_authority(node_id, authority_scraped, local_val):
+                            self.stats['authorities']['scraped'] += 1
+                            
+                    elif action == 'update_both_from_scraped':
+                        success = True
+                        if not self.update_scraped_authority(node_id, authority_scraped, scraped_val):
+                            success = False
+                        if not self.update_local_authority(node_id, authority_local_name, scraped_val):
+                            success = False
+                        if success:
+                            self.stats['authorities']['both'] += 1
+                            
+                    elif action == 'update_both_from_local':
+                        success = True
+                        if not self.update_scraped_authority(node_id, authority_scraped, local_val):
+                            success = False
+                        if not self.update_local_authority(node_id, authority_local_name, local_val):
+                            success = False
+                        if success:
+                            self.stats['authorities']['both'] += 1
+                            
+                    elif action == 'delete_local':
+                        if self.update_local_authority(node_id, authority_local_name, ''):
+                            self.stats['authorities']['deleted'] += 1
+                
+                self.flush_updates()
+        except sqlite3.Error as e:
+            print(f"  ERROR applying authority citation updates, rolled back: {e}")
+            discarded = self.discard_report('authorities', node_ids, snapshot)
+            print(f"  Discarded {discarded} logged changes from this report")
+        
+        self.report_unknown_decisions(unknown_decisions)
         
         print(f"\n  Authority citation updates:")
         print(f"    Scraped DB updated: {self.stats['authorities']['scraped']}")
@@ -512,17 +803,18 @@ class ReviewDecisionApplicator:
         print(f"    Local deleted: {self.stats['authorities']['deleted']}")
         print(f"    Skipped: {self.stats['authorities']['skipped']}")
     
-    def process_attestations(self, report_path: str):
-        """Process attestation mismatch report"""
+    def process_attestations(self, report_path: str, loaded: Optional[Future] = None):
+        """Process attestation mismatch report, optionally already being loaded by `load_report`"""
         print("\n" + "="*80)
         print("PROCESSING ATTESTATION MISMATCHES")
         print("="*80)
         
-        if not Path(report_path).exists():
+        report = loaded.result() if loaded else self.load_report('attestations', report_path)
+        if report is None:
             print(f"  WARNING: Report not found: {report_path}")
             return
         
-        df = pd.read_csv(report_path, encoding='utf-8-sig')
+        df, node_ids, scraped_rows, local_rows = report
         
         if 'Decision' not in df.columns:
             print("  ERROR: 'Decision' column not found in report")
@@ -530,56 +822,76 @@ class ReviewDecisionApplicator:
         
         print(f"  Loaded {len(df)} attestation mismatches")
         
-        for idx, row in df.iterrows():
-            node_id = str(row['node_id'])
-            language = row['language']
-            scraped_val = row['scraped_value']
-            local_val = row['local_value']
-            decision = row['Decision']
-            
-            action, check_spanish = self.normalize_decision(decision)
-            
-            if check_spanish:
-                self.spanish_attestation_notes.append({
-                    'node_id': node_id,
-                    'headword': row.get('headword', ''),
-                    'field_type': f'attestation_{language}',
-                    'note': decision
-                })
-            
-            if action == 'skip':
-                self.stats['attestations']['skipped'] += 1
-                continue
-            
-            if action == 'use_scraped_update_local':
-                if self.update_local_attestation(node_id, language, scraped_val):
-                    self.stats['attestations']['local'] += 1
-                    
-            elif action == 'use_local_update_scraped':
-                if self.update_scraped_attestation(node_id, language, local_val):
-                    self.stats['attestations']['scraped'] += 1
+        self.index_scraped_rows('attestations', scraped_rows)
+        self.index_local_values(local_rows, LOCAL_ATTESTATION_COLUMNS)
+        
+        unknown_decisions: Counter[str] = collections.Counter()
+        snapshot = self.snapshot_report('attestations')
+        
+        # One transaction per database for the whole report: committed on
+        # success, rolled back together if anything in the report fails
+        try:
+            with self.scraped_conn, self.local_conn: # type: ignore
+                rows = zip(
+                    node_ids,
+                    df['language'].tolist(),
+                    df['scraped_value'].tolist(),
+                    df['local_value'].tolist(),
+                    df['Decision'].tolist(),
+                    self.report_column(df, 'headword'),
+                    *classify_decisions(df['Decision'], unknown_decisions)
+                )
+                for node_id, language, scraped_val, local_val, decision, headword, action, check_spanish in rows:
                     
-            elif action == 'update_both_from_scraped':
-                success = True
-                if not self.update_scraped_attestation(node_id, language, scraped_val):
-                    success = False
-                if not self.update_local_attestation(node_id, language, scraped_val):
-                    success = False
-                if success:
-                    self.stats['attestations']['both'] += 1
+                    if check_spanish:
+                        self.spanish_attestation_notes.append({
+                            'node_id': node_id,
+                            'headword': headword,
+                            'field_type': f'attestation_{language}',
+                            'note': decision
+                        })
                     
-            elif action == 'update_both_from_local':
-                success = True
-                if not self.update_scraped_attestation(node_id, language, local_val):
-                    success = False
-                if not self.update_local_attestation(node_id, language, local_val):
-                    success = False
-                if success:
-                    self.stats['attestations']['both'] += 1
+                    if action == 'skip':
+                        self.stats['attestations']['skipped'] += 1
+                        continue
                     
-            elif action == 'delete_local':
-                if self.update_local_attestation(node_id, language, ''):
-                    self.stats['attestations']['deleted'] += 1
+                    if action == 'use_scraped_update_local':
+                        if self.update_local_attestation(node_id, language, scraped_val):
+                            self.stats['attestations']['local'] += 1
+                            
+                    elif action == 'use_local_update_scraped':
+                        if self.update_scraped_attestation(node_id, language, local_val):
+                            self.stats['attestations']['scraped'] += 1
+                            
+                    elif action == 'update_both_from_scraped':
+                        success = True
+                        if not self.update_scraped_attestation(node_id, language, scraped_val):
+                            success = False
+                        if not self.update_local_attestation(node_id, language, scraped_val):
+                            success = False
+                        if success:
+                            self.stats['attestations']['both'] += 1
+                            
+                    elif action == 'update_both_from_local':
+                        success = True
+                        if not self.update_scraped_attestation(node_id, language, local_val):
+                            success = False
+                        if not self.update_local_attestation(node_id, language, local_val):
+                            success = False
+                        if success:
+                            self.stats['attestations']['both'] += 1
+                            
+                    elif action == 'delete_local':
+                        if self.update_local_attestation(node_id, language, ''):
+                            self.stats['attestations']['deleted'] += 1
+                
+                self.flush_updates()
+        except sqlite3.Error as e:
+            print(f"  ERROR applying attestation updates, rolled back: {e}")
+            discarded = self.discard_report('attestations', node_ids, snapshot)
+            print(f"  Discarded {discarded} logged changes from this report")
+        
+        self.report_unknown_decisions(unknown_decisions)
         
         print(f"\n  Attestation updates:")
         print(f"    Scraped DB updated: {self.stats['attestations']['scraped']}")
@@ -588,8 +900,35 @@ class ReviewDecisionApplicator:
         print(f"    Local deleted: {self.stats['attestations']['deleted']}")
         print(f"    Skipped: {self.stats['attestations']['skipped']}")
     
+    def process_reports(self, translations_path: str, authorities_path: str, attestations_path: str):
+        """
+        Process the three reports in order. Each report's current values are read on the
+        read connections while the previous report is written; the reports update disjoint
+        tables/columns, so reading ahead of the previous report's commit is safe
+        """
+        steps = [
+            (self.process_translations, 'translations', translations_path),
+            (self.process_authorities, 'authorities', authorities_path),
+            (self.process_attestations, 'attestations', attestations_path)
+        ]
+        
+        # The main thread is the only writer, one reader thread stays a report ahead of it
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            pending = reader.submit(self.load_report, steps[0][1], steps[0][2])
+            for i, (process, _, report_path) in enumerate(steps):
+                loaded = pending
+                if i + 1 < len(steps):
+                    pending = reader.submit(self.load_report, steps[i + 1][1], steps[i + 1][2])
+                process(report_path, loaded)
+    
     def create_checkpoints(self):
-        """Create new checkpoint tables in both databases"""
+        """
+        Checkpoint both databases after applying the decisions.
+        
+        'file' mode (default) writes a standalone snapshot of each database next to it
+        with VACUUM INTO, a page-level copy. 'table' mode keeps the old behaviour of a
+        CREATE TABLE ... AS SELECT copy inside each database.
+        """
         if self.dry_run:
             print("\n" + "="*80)
             print("CHECKPOINT CREATION (DRY RUN - SKIPPED)")
@@ -601,54 +940,54 @@ class ReviewDecisionApplicator:
         print("="*80)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        checkpoint_name = f"checkpoint_after_manual_review_{timestamp}"
         
-        local_checkpoint_name = f"checkpoint_after_manual_review_{timestamp}"
-        print(f"\n  Creating local checkpoint: {local_checkpoint_name}")
-        
-        try:
-            self.local_conn.execute(f"""
-                CREATE TABLE [{local_checkpoint_name}] AS 
-                SELECT * FROM [{self.local_table}]
-            """)
-            self.local_conn.commit()
-            
-            row_count = self.local_conn.execute(
-                f"SELECT COUNT(*) FROM [{local_checkpoint_name}]"
-            ).fetchone()[0]
-            
-            print(f"   Created with {row_count:,} rows")
-        except Exception as e:
-            print(f"    ERROR creating local checkpoint: {e}")
-        
-        scraped_checkpoint_name = f"checkpoint_after_manual_review_{timestamp}"
-        print(f"\n  Creating scraped checkpoint: {scraped_checkpoint_name}")
-        
-        try:
-            self.scraped_conn.execute(f"""
-                CREATE TABLE [{scraped_checkpoint_name}] AS 
-                SELECT * FROM dictionary_entries
-            """)
-            self.scraped_conn.commit()
-            
-            row_count = self.scraped_conn.execute(
-                f"SELECT COUNT(*) FROM [{scraped_checkpoint_name}]"
-            ).fetchone()[0]
-            
-            print(f"   Created with {row_count:,} rows")
-        except Exception as e:
-            print(f"    ERROR creating scraped checkpoint: {e}")
+        for label, conn, db_path, source_table in (
+            ('local', self.local_conn, self.local_db_path, self.local_table),
+            ('scraped', self.scraped_conn, self.scraped_db_path, 'dictionary_entries')
+        ):
+            try:
+                if self.checkpoint_mode == 'table':
+                    print(f"\n  Creating {label} checkpoint: {checkpoint_name}")
+                    conn.execute(f"""
+                        CREATE TABLE [{checkpoint_name}] AS 
+                        SELECT * FROM [{source_table}]
+                    """) # type: ignore
+                    conn.commit() # type: ignore
+                    count_table = checkpoint_name
+                else:
+                    snapshot_path = db_path.with_name(f"{db_path.stem}_{checkpoint_name}{db_path.suffix}")
+                    print(f"\n  Creating {label} checkpoint: {snapshot_path}")
+                    conn.execute("VACUUM INTO ?", (str(snapshot_path),)) # type: ignore
+                    count_table = source_table
+                
+                row_count = conn.execute( # type: ignore
+                    f"SELECT COUNT(*) FROM [{count_table}]"
+                ).fetchone()[0]
+                
+                print(f"   Created with {row_count:,} rows in {source_table}")
+            except Exception as e:
+                print(f"    ERROR creating {label} checkpoint: {e}")
     
     def save_changes_log(self):
-        """Save detailed changes log to CSV"""
+        """Save detailed changes log to CSV, or to Parquet for large logs"""
         if not self.changes_log:
             print("\n  No changes to log")
             return
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"changes_log_{timestamp}.csv"
         
-        df = pd.DataFrame(self.changes_log)
-        df.to_csv(log_filename, index=False, encoding='utf-8-sig')
+        log_format = self.log_format
+        if log_format == 'auto':
+            log_format = 'parquet' if len(self.changes_log) > PARQUET_LOG_THRESHOLD else 'csv'
+        
+        df = pd.DataFrame.from_records(self.changes_log, columns=CHANGES_LOG_COLUMNS)
+        if log_format == 'parquet':
+            log_filename = f"changes_log_{timestamp}.parquet"
+            df.to_parquet(log_filename, engine='pyarrow', compression='zstd', index=False)
+        else:
+            log_filename = f"changes_log_{timestamp}.csv"
+            df.to_csv(log_filename, index=False, encoding='utf-8-sig')
         
         print(f"\n  Changes log saved: {log_filename}")
         print(f"    Total changes: {len(self.changes_log)}")
@@ -700,6 +1039,9 @@ class ReviewDecisionApplicator:
         if self.spanish_attestation_notes:
             print(f"\n  ⚠ Spanish attestation checks needed: {len(self.spanish_attestation_notes)}")
             print(f"    See: spanish_attestation_followup_*.csv")
+        
+        if self.unknown_decisions:
+            print(f"\n  ⚠ Unrecognized decisions skipped: {sum(self.unknown_decisions.values())}")
 
 
 def main():
@@ -732,6 +1074,29 @@ def main():
         default='checkpoint_llm_validated_20251030',
         help='Local checkpoint table name'
     )
+    parser.add_argument(
+        '--fsync',
+        choices=['normal', 'full'],
+        default='normal',
+        help='SQLite synchronous level when applying; use full for power-loss safety (default: normal)'
+    )
+    parser.add_argument(
+        '--checkpoint-mode',
+        choices=['file', 'table'],
+        default='file',
+        help='Snapshot each database to a separate file, or copy into a checkpoint table inside it (default: file)'
+    )
+    parser.add_argument(
+        '--log-format',
+        choices=['auto', 'csv', 'parquet'],
+        default='auto',
+        help=f'Changes log format; auto writes Parquet above {PARQUET_LOG_THRESHOLD:,} changes (default: auto)'
+    )
+    parser.add_argument(
+        '--log-overrides',
+        action='store_true',
+        help='Log every intermediate write to a field, not just its final value per report'
+    )
     
     args = parser.parse_args()
     
@@ -746,15 +1111,21 @@ def main():
         scraped_db_path=args.scraped_db,
         local_db_path=args.local_db,
         local_table=args.local_table,
-        dry_run=dry_run
+        dry_run=dry_run,
+        fsync=args.fsync,
+        checkpoint_mode=args.checkpoint_mode,
+        log_format=args.log_format,
+        log_overrides=args.log_overrides
     )
     
     try:
         applicator.connect()
         
-        applicator.process_translations('./src/notebooks/cross_validation/report_translation_mismatches.csv')
-        applicator.process_authorities('./src/notebooks/cross_validation/report_authority_mismatches.csv')
-        applicator.process_attestations('./src/notebooks/cross_validation/report_attestation_mismatches.csv')
+        applicator.process_reports(
+            './src/notebooks/cross_validation/report_translation_mismatches.csv',
+            './src/notebooks/cross_validation/report_authority_mismatches.csv',
+            './src/notebooks/cross_validation/report_attestation_mismatches.csv'
+        )
         
         applicator.create_checkpoints()
         applicator.save_changes_log()
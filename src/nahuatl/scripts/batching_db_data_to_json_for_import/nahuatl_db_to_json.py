@@ -1,142 +1,282 @@
 # from initial sqLite table get it already in json format skip all csv shenanigans as formatting becomes an issue
 
+import os
 import sqlite3
+import numpy as np
 import pandas as pd
 import json
 import re
-from typing import List, Dict, Optional
+import orjson
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Sequence
 
-class NahuatlJsonExporter:
-    """Transformed db to batch import JSON format"""
+# Page number patterns in priority order; each anchored alternative looks ahead
+# through the whole citation, so the first pattern found anywhere wins, as it
+# would searching them one at a time
+PAGE_NUMBER_RE = re.compile(
+    '|'.join(f'^(?=.*?{pattern})' for pattern in (
+        r'f\.\s*(\d+[rv]?)',           # f. 5r
+        r'p\.\s*(\d+)',                # p. 123
+        r',\s*(\d+[rv]?)\.',           # , 6.
+        r',\s*(\d+–\d+)',              # , 214–215
+        r'(\d+–\d+)\.',                # 242–243.
+        r'vol\.\s*\d+,\s*(\d+–\d+)',   # vol. 2, 214–215
+    )),
+    re.DOTALL
+)
+
+# Rows read from SQLite into each DataFrame chunk
+READ_CHUNKSIZE = 5000
+
+# Chunks queued per worker process, bounding how far ahead of the writer a table is read
+CHUNKS_PER_WORKER = 2
+
+# reference tbl abbreviations, by the author name found in citations
+AUTHORITY_NAMES = {
+    'Molina': 'VLM',
+    'Karttunen': 'AND',
+    'Carochi': 'GML',
+    'Olmos': 'ALM',
+    'Lockhart': 'NWN'
+}
+
+# One regex over the lowercased citation, group named by abbreviation; like
+# PAGE_NUMBER_RE, the first author in AUTHORITY_NAMES order found anywhere wins
+AUTHORITY_RE = re.compile(
+    '|'.join(
+        f'^(?=.*?(?P<{abbrev}>{re.escape(author_name.lower())}))'
+        for author_name, abbrev in AUTHORITY_NAMES.items()
+    ),
+    re.DOTALL
+)
+
+# WHP authority columns and their reference table abbreviations
+WHP_AUTHORITY_COLUMNS = {
+    'Alonso de Molina': 'VLM',
+    'Frances Karttunen': 'AND',
+    'Horacio Carochi / English': 'GML',
+    'Andrés de Olmos': 'ALM',
+    "Lockhart's Nahuatl as Written": 'NWN'
+}
+
+# IDIEZ columns compiled into the source entry, with their labels
+IDIEZ_SOURCE_FIELDS = {
+    'tlahtolli': 'IDIEZ morfema',
+    'IDIEZ traduc. inglés': 'IDIEZ traduc. inglés',
+    'IDIEZ def. náhuatl': 'IDIEZ def. náhuatl',
+    'IDIEZ def. español': 'IDIEZ def. español',
+    'IDIEZ morfología': 'IDIEZ morfología',
+    'IDIEZ gramática': 'IDIEZ gramática'
+}
+
+def present(column: pd.Series) -> pd.Series:
+    """Mask of cells that are neither null nor falsy (e.g. empty strings)"""
+    return column.notna() & column.astype(bool)
+
+def cells_or_none(column: pd.Series, mask: pd.Series) -> np.ndarray:
+    """Column values where mask holds, None elsewhere"""
+    return np.where(mask.to_numpy(), column.to_numpy(dtype=object), None)
+
+def write_json_array(output_path: str, entries: Iterable[Dict]) -> int:
+    """Write entries as an indented JSON array one at a time, returning how many were written
     
-    def __init__(self, db_path: str):
-        self.conn = sqlite3.connect(db_path)
-        
-        # reference tbl abbreviations
-        self.authority_mapping = {
-            'Molina': 'VLM',
-            'Karttunen': 'AND',
-            'Carochi': 'GML',
-            'Olmos': 'ALM',
-            'Lockhart': 'NWN'
-        }
+    Each entry is encoded with orjson and indented one level, so the file is laid
+    out as json.dump(..., indent=2) would lay it out, behind a UTF-8 BOM.
+    """
+    count = 0
+    with open(output_path, 'wb') as f:
+        f.write(b'\xef\xbb\xbf[')
+        for entry in entries:
+            # Encoded strings never hold raw newlines, so this only indents structure
+            f.write(b'\n  ' if count == 0 else b',\n  ')
+            f.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+            count += 1
+        f.write(b'\n]' if count else b']')
+    return count
+
+# The same citations recur across many entries, so both lookups are cached per process
+@lru_cache(maxsize=None)
+def extract_page_number(citation: str) -> str:
+    """Extract page number from citation using regex"""
+    if not citation:
+        return ""
     
-    def extract_page_number(self, citation: str) -> str:
-        """Extract page number from citation using regex"""
-        if not citation:
-            return ""
+    # Only the matching alternative's group is set
+    match = PAGE_NUMBER_RE.match(citation)
+    if match:
+        return match.group(match.lastindex)
+    
+    return ""
+
+@lru_cache(maxsize=None)
+def match_citation_to_authority(citation: str) -> Optional[str]:
+    """Match citation to authority abbreviation by author name"""
+    match = AUTHORITY_RE.match(citation.lower())
+    return match.lastgroup if match else None
+
+def parse_citations(citations_text: str) -> List[str]:
+    """Parse pipe-separated citation tags, '' where there are none"""
+    if not citations_text:
+        return []
+    
+    # Split by pipe and clean
+    citations = [c.strip() for c in citations_text.split('|')]
+    return citations
+
+def build_whp_sources(citations: List[str], authority_contents: Sequence[Optional[str]]) -> List[Dict]:
+    """Build Sources JSON for WHP/Classical Nahuatl entry
+    
+    authority_contents holds one cell per WHP_AUTHORITY_COLUMNS entry, None
+    where the column is empty.
+    """
+    sources = []
+    
+    # Classify each citation once, keeping citation order within each authority
+    citations_by_abbrev = defaultdict(list)
+    for cit in citations:
+        citations_by_abbrev[match_citation_to_authority(cit)].append(cit)
+    
+    # Process each authority column
+    for abbrev, authority_content in zip(WHP_AUTHORITY_COLUMNS.values(), authority_contents):
+        if authority_content is None:
+            continue
         
-        patterns = [
-            r'f\.\s*(\d+[rv]?)',           # f. 5r
-            r'p\.\s*(\d+)',                # p. 123
-            r',\s*(\d+[rv]?)\.',           # , 6.
-            r',\s*(\d+–\d+)',              # , 214–215
-            r'(\d+–\d+)\.',                # 242–243.
-            r'vol\.\s*\d+,\s*(\d+–\d+)',   # vol. 2, 214–215
-        ]
+        # Find matching citations
+        matching_citations = citations_by_abbrev.get(abbrev, [])
         
-        for pattern in patterns:
-            match = re.search(pattern, citation)
-            if match:
-                return match.group(1)
+        # Create source entry for each matching citation
+        for citation in matching_citations:
+            page_number = extract_page_number(citation)
             
-        return ""
+            sources.append({
+                "source": abbrev,
+                "page_number": page_number,
+                "original_entry": authority_content + " " + citation
+            })
+        
+        # If no matching citation found but column has content, add without bibliography
+        if not matching_citations:
+            sources.append({
+                "source": abbrev,
+                "page_number": "",
+                "original_entry": authority_content,
+            })
     
-    def match_citation_to_authority(self, citation: str) -> Optional[str]:
-        """Match citation to authority abbreviation by author name"""
-        citation_lower = citation.lower()
-        
-        for author_name, abbrev in self.authority_mapping.items():
-            if author_name.lower() in citation_lower:
-                return abbrev
-        
-        return None
+    return sources
+
+def build_idiez_sources(original_entry: str) -> List[Dict]:
+    """Build Sources JSON for IDIEZ/Huasteca Nahuatl entry from its compiled fields"""
+    return [{
+        "source": "IDIEZ",
+        "page_number": "",
+        "original_entry": original_entry
+    }]
+
+def compile_idiez_entries(df: pd.DataFrame) -> List[str]:
+    """Compile each row's IDIEZ fields into one labelled entry text"""
+    # One labelled column per field, '' where the field is empty
+    labelled = [
+        (label + ": " + df[col].astype(str)).where(present(df[col]), "").to_numpy()
+        for col, label in IDIEZ_SOURCE_FIELDS.items()
+    ]
     
-    def parse_citations(self, citations_text: str) -> List[str]:
-        """Parse pipe-separated citation tags"""
-        if not citations_text or pd.isna(citations_text):
-            return []
-        
-        # Split by pipe and clean
-        citations = [c.strip() for c in citations_text.split('|')]
-        return citations
+    original_entries = []
+    for row_fields in zip(*labelled):
+        fields = [field for field in row_fields if field]
+        original_entries.append(". ".join(fields) + "." if fields else "")
+    return original_entries
+
+def process_whp_chunk(df: pd.DataFrame) -> List[Dict]:
+    """Entries for one chunk of WHP rows"""
+    # Column-wise preparation: citations parsed once per row (missing ones
+    # filled with '' in one pass), empty or 'None' authority cells and empty
+    # themes blanked to None up front
+    citations = df['Citations'].fillna("").map(parse_citations).to_numpy()
+    authority_columns = [
+        cells_or_none(df[col], present(df[col]) & df[col].ne('None'))
+        for col in WHP_AUTHORITY_COLUMNS
+    ]
+    themes = cells_or_none(df['themes'], present(df['themes']))
     
-    def build_whp_sources(self, row: pd.Series) -> List[Dict]:
-        """Build Sources JSON for WHP/Classical Nahuatl entry"""
-        sources = []
-        citations = self.parse_citations(row['Citations'])
-        
-        # Authority columns to check
-        authority_columns = {
-            'Alonso de Molina': 'VLM',
-            'Frances Karttunen': 'AND',
-            'Horacio Carochi / English': 'GML',
-            'Andrés de Olmos': 'ALM',
-            "Lockhart's Nahuatl as Written": 'NWN'
+    rows = zip(
+        df['Headword'].to_numpy(),
+        # Missing glosses read as None or NaN depending on the chunk, both become ''
+        df['Principal English Translation'].fillna("").to_numpy(),
+        themes,
+        citations,
+        zip(*authority_columns)
+    )
+    entries = []
+    for headword, gloss, theme, row_citations, authority_contents in rows:
+        entry = {
+            'Headwords': headword,
+            'Gloss': gloss,
+            'Language': 'Classical Nahuatl',
+            'Sources': build_whp_sources(row_citations, authority_contents)
         }
         
-        # Process each authority column
-        for col_name, abbrev in authority_columns.items():
-            authority_content = row.get(col_name)
-            
-            # Skip if None or empty
-            if not authority_content or pd.isna(authority_content) or authority_content == 'None':
-                continue
-            
-            # Find matching citations
-            matching_citations = [
-                cit for cit in citations 
-                if self.match_citation_to_authority(cit) == abbrev
-            ]
-            
-            # Create source entry for each matching citation
-            for citation in matching_citations:
-                page_number = self.extract_page_number(citation)
-                
-                sources.append({
-                    "source": abbrev,
-                    "page_number": page_number,
-                    "original_entry": authority_content + " " + citation
-                })
-            
-            # If no matching citation found but column has content, add without bibliography
-            if not matching_citations:
-                sources.append({
-                    "source": abbrev,
-                    "page_number": "",
-                    "original_entry": authority_content,
-                })
+        # Add themes if present
+        if theme is not None:
+            entry['Themes'] = theme
         
-        return sources
-        
-    def build_idiez_sources(self, row: pd.Series) -> List[Dict]:
-        """Build Sources JSON for IDIEZ/Huasteca Nahuatl entry"""
-        # Compile all IDIEZ fields
-        fields = []
-        
-        if row.get('tlahtolli') and not pd.isna(row.get('tlahtolli')):
-            fields.append(f"IDIEZ morfema: {row['tlahtolli']}")
-        if row.get('IDIEZ traduc. inglés') and not pd.isna(row.get('IDIEZ traduc. inglés')):
-            fields.append(f"IDIEZ traduc. inglés: {row['IDIEZ traduc. inglés']}")
-        if row.get('IDIEZ def. náhuatl') and not pd.isna(row.get('IDIEZ def. náhuatl')):
-            fields.append(f"IDIEZ def. náhuatl: {row['IDIEZ def. náhuatl']}")
-        if row.get('IDIEZ def. español') and not pd.isna(row.get('IDIEZ def. español')):
-            fields.append(f"IDIEZ def. español: {row['IDIEZ def. español']}")
-        if row.get('IDIEZ morfología') and not pd.isna(row.get('IDIEZ morfología')):
-            fields.append(f"IDIEZ morfología: {row['IDIEZ morfología']}")
-        if row.get('IDIEZ gramática') and not pd.isna(row.get('IDIEZ gramática')):
-            fields.append(f"IDIEZ gramática: {row['IDIEZ gramática']}")
-        
-        original_entry = ". ".join(fields) + "." if fields else ""
+        entries.append(entry)
+    return entries
+
+def process_idiez_chunk(df: pd.DataFrame) -> List[Dict]:
+    """Entries for one chunk of IDIEZ rows"""
+    rows = zip(
+        df['OND_Node_Title'].to_numpy(),
+        df['IDIEZ traduc. inglés'].fillna("").to_numpy(),
+        compile_idiez_entries(df)
+    )
+    return [
+        {
+            'Headwords': headword,
+            'Gloss': gloss,
+            'Language': 'Huasteca Nahuatl',
+            'Sources': build_idiez_sources(original_entry)
+        }
+        for headword, gloss, original_entry in rows
+    ]
+
+class NahuatlJsonExporter:
+    """Transformed db to batch import JSON format"""
+    
+    def __init__(self, db_path: str, workers: Optional[int] = None):
+        self.conn = sqlite3.connect(db_path)
+        # Larger page cache and memory-mapped reads for the full-table scans
+        self.conn.execute("PRAGMA cache_size = -200000")
+        self.conn.execute("PRAGMA mmap_size = 268435456")
         
-        return [{
-            "source": "IDIEZ",
-            "page_number": "",
-            "original_entry": original_entry
-        }]
+        # Processes transforming chunks; 1 transforms them in this process
+        self.workers = workers or os.cpu_count() or 1
+    
+    def transform_chunks(self, transform: Callable[[pd.DataFrame], List[Dict]],
+                         chunks: Iterable[pd.DataFrame]) -> Iterator[Dict]:
+        """Yield the entries transform makes from each chunk, in chunk order
         
-    def process_whp_data(self, limit: Optional[int] = None) -> List[Dict]:
-        """Process WHP data to JSON format"""
+        Chunks are read here and transformed in worker processes, with at most
+        CHUNKS_PER_WORKER per worker queued ahead of the one being yielded.
+        """
+        if self.workers == 1:
+            for df in chunks:
+                yield from transform(df)
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for df in chunks:
+                pending.append(executor.submit(transform, df))
+                if len(pending) >= self.workers * CHUNKS_PER_WORKER:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    
+    def process_whp_data(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Process WHP data to JSON format, yielding one entry per row"""
         print("Loading WHP data...")
         
         query = """
@@ -162,33 +302,16 @@ class NahuatlJsonExporter:
         if limit:
             query += f" LIMIT {limit}"
         
-        df = pd.read_sql(query, self.conn)
-        
-        print(f"Processing {len(df)} WHP entries...")
+        print(f"Processing WHP entries in chunks of {READ_CHUNKSIZE}...")
         
-        export_rows = []
-        
-        for idx, row in df.iterrows():
-            if idx % 1000 == 0: # type: ignore
+        chunks = pd.read_sql(query, self.conn, chunksize=READ_CHUNKSIZE)
+        for idx, entry in enumerate(self.transform_chunks(process_whp_chunk, chunks)):
+            if idx % 1000 == 0:
                 print(f"  Processing WHP entry {idx}...")
-            
-            entry = {
-                'Headwords': row['Headword'],
-                'Gloss': row['Principal English Translation'] or "",
-                'Language': 'Classical Nahuatl',
-                'Sources': self.build_whp_sources(row)
-            }
-            
-            # Add themes if present
-            if row.get('themes') and not pd.isna(row['themes']):
-                entry['Themes'] = row['themes']
-            
-            export_rows.append(entry)
-        
-        return export_rows
+            yield entry
     
-    def process_idiez_data(self, limit: Optional[int] = None) -> List[Dict]:
-        """Process IDIEZ data to JSON format"""
+    def process_idiez_data(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Process IDIEZ data to JSON format, yielding one entry per row"""
         print("\nLoading IDIEZ data...")
         
         query = """
@@ -209,33 +332,19 @@ class NahuatlJsonExporter:
         if limit:
             query += f" LIMIT {limit}"
         
-        df = pd.read_sql(query, self.conn)
-        
-        print(f"Processing {len(df)} IDIEZ entries...")
+        print(f"Processing IDIEZ entries in chunks of {READ_CHUNKSIZE}...")
         
-        export_rows = []
-        
-        for idx, row in df.iterrows():
-            if idx % 1000 == 0: # type: ignore
+        chunks = pd.read_sql(query, self.conn, chunksize=READ_CHUNKSIZE)
+        for idx, entry in enumerate(self.transform_chunks(process_idiez_chunk, chunks)):
+            if idx % 1000 == 0:
                 print(f"  Processing IDIEZ entry {idx}...")
-            
-            entry = {
-                'Headwords': row['OND_Node_Title'],
-                'Gloss': row['IDIEZ traduc. inglés'] or "",
-                'Language': 'Huasteca Nahuatl',
-                'Sources': self.build_idiez_sources(row)
-            }
-            
-            # Add themes if present
-            if row.get('themes') and not pd.isna(row['themes']):
-                entry['Themes'] = row['themes']
-                
-            export_rows.append(entry)
-        
-        return export_rows
+            yield entry
     
-    def export_combined_json(self, output_path: str = "data/nahuatl_batch_import.json", limit: Optional[int] = None):
-        """Export both WHP and IDIEZ to single combined JSON"""
+    def export_combined_json(self, output_path: str = "data/nahuatl_batch_import.json", limit: Optional[int] = None) -> Dict[str, int]:
+        """Export both WHP and IDIEZ to single combined JSON, returning entry counts per language
+        
+        Entries are written as they are processed; neither dataset is held in memory.
+        """
         
         print("="*70)
         print("EXPORTING COMBINED NAHUATL LEXICON TO JSON")
@@ -244,37 +353,45 @@ class NahuatlJsonExporter:
         print("="*70)
         print()
         
-        # Process WHP
-        whp_entries = self.process_whp_data(limit=limit)
+        counts = Counter()
+        # Only kept for the sample printed in small test runs
+        sample = [] if limit and limit <= 5 else None
         
-        # Process IDIEZ
-        idiez_entries = self.process_idiez_data(limit=limit)
+        def tally(entries):
+            for entry in entries:
+                counts[entry['Language']] += 1
+                if sample is not None:
+                    sample.append(entry)
+                yield entry
         
-        # Combine
-        print("\nCombining datasets...")
-        combined_entries = whp_entries + idiez_entries
-        
-        # Export to JSON
+        # WHP then IDIEZ, each processed as it is written
         print(f"Writing JSON to {output_path}...")
-        with open(output_path, 'w', encoding='utf-8-sig') as f:
-            json.dump(combined_entries, f, ensure_ascii=False, indent=2)
+        total = write_json_array(
+            output_path,
+            tally(chain(self.process_whp_data(limit=limit), self.process_idiez_data(limit=limit)))
+        )
         
         print(f"\n{'='*70}")
         print(f"✓ EXPORT COMPLETE")
         print(f"{'='*70}")
-        print(f"Total entries: {len(combined_entries)}")
-        print(f"  - Classical Nahuatl: {len(whp_entries)}")
-        print(f"  - Huasteca Nahuatl: {len(idiez_entries)}")
+        print(f"Total entries: {total}")
+        print(f"  - Classical Nahuatl: {counts['Classical Nahuatl']}")
+        print(f"  - Huasteca Nahuatl: {counts['Huasteca Nahuatl']}")
         print(f"\nOutput file: {output_path}")
         
+        # Worker processes keep their own caches, so only an in-process run has these
+        if self.workers == 1:
+            print(f"Authority lookups: {match_citation_to_authority.cache_info()}")
+            print(f"Page number lookups: {extract_page_number.cache_info()}")
+        
         # Print sample output for verification
-        if limit and limit <= 5:
+        if sample is not None:
             print(f"\n{'='*70}")
             print("SAMPLE OUTPUT:")
             print(f"{'='*70}")
-            print(json.dumps(combined_entries, ensure_ascii=False, indent=2))
+            print(json.dumps(sample, ensure_ascii=False, indent=2))
         
-        return combined_entries
+        return dict(counts)
 
 
 # Usage
@@ -284,7 +401,7 @@ if __name__ == "__main__":
     
     # TEST: Export only 2 records from each dataset
     # print("Running TEST with 2 records per dataset...\n")
-    # test_data = exporter.export_combined_json("data/nahuatl_test_2records.json", limit=2)
+    # test_counts = exporter.export_combined_json("data/nahuatl_test_2records.json", limit=2)
     
     # Uncomment below to run full export
-    combined_data = exporter.export_combined_json("data/nahuatl_batch_import.json")
\ No newline at end of file
+    counts = exporter.export_combined_json("data/nahuatl_batch_import.json")
\ No newline at end of file
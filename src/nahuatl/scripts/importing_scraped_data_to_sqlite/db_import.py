@@ -3,14 +3,47 @@ Database Import Pipeline for Nahuatl Dictionary
 Imports scraped CSV data into nahuatl.db following schema.sql
 """
 
+import os
+import re
 import sqlite3
 import pandas as pd
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 import sys
 
+# Most rows bound by one multi-row INSERT; fewer when the table is too wide
+# for SQLite's bound-parameter limit
+INSERT_BATCH_ROWS = 1000
+
+# CREATE INDEX statements in schema.sql, which can be held back until the data is loaded
+INDEX_DDL_RE = re.compile(r'^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\b[^;]*;', re.IGNORECASE | re.MULTILINE)
+
+# Rows per chunk when streaming a CSV through pandas
+READ_CHUNKSIZE = 50_000
+
+# Id columns, parsed straight to int64 wherever a CSV holding them is read
+ID_DTYPES: Dict[Hashable, str] = {
+    'node_id': 'int64',
+    'tid': 'int64',
+    'entry_node_id': 'int64',
+    'audio_node_id': 'int64'
+}
+
+# Columns of each CSV that foreign key validation compares
+KEY_COLUMNS = {
+    'dictionary_entries.csv': ['node_id'],
+    'themes.csv': ['slug'],
+    'audio_files.csv': ['node_id'],
+    'entry_themes.csv': ['entry_node_id', 'theme_slug'],
+    'entry_audio.csv': ['entry_node_id', 'audio_node_id'],
+    'attestations.csv': ['node_id'],
+    'authority_citations.csv': ['node_id']
+}
+
 
 class DatabaseImporter:
     """Import CSV data into SQLite database"""
@@ -45,6 +78,15 @@ class DatabaseImporter:
             'entry_audio': {'imported': 0, 'skipped': 0, 'errors': 0}
         }
         
+        # Index statements held back by create_database(defer_indexes=True)
+        self._deferred_indexes: List[str] = []
+        
+        # Distinct key values per CSV, read once for all foreign key checks
+        self._key_values: Dict[str, Dict[str, pd.Index]] = {}
+        
+        # Header row per CSV, parsed at most once
+        self._headers: Dict[str, List[str]] = {}
+        
         # Connection (will be set during import)
         self.conn: Optional[sqlite3.Connection] = None
     
@@ -66,12 +108,14 @@ class DatabaseImporter:
         
         return logger
     
-    def create_database(self, fresh: bool = True) -> None:
+    def create_database(self, fresh: bool = True, defer_indexes: bool = False) -> None:
         """
         Create database from schema.sql
         
         Args:
             fresh: If True, drop existing database and recreate
+            defer_indexes: If True, leave the schema's indexes for create_indexes
+                to build once the tables are loaded
         """
         if fresh and self.db_path.exists():
             self.logger.info(f"Removing existing database: {self.db_path}")
@@ -93,6 +137,15 @@ class DatabaseImporter:
             # Enable foreign keys
             conn.execute("PRAGMA foreign_keys = ON")
             
+            # Larger pages suit the bulk-loaded tables; only takes effect before
+            # the first table is written
+            conn.execute("PRAGMA page_size = 32768")
+            
+            # Building each index once over loaded tables beats updating it per insert
+            if defer_indexes:
+                self._deferred_indexes = INDEX_DDL_RE.findall(schema_sql)
+                schema_sql = INDEX_DDL_RE.sub('', schema_sql)
+            
             # Execute schema (split by semicolon to handle multiple statements)
             conn.executescript(schema_sql)
             conn.commit()
@@ -132,73 +185,139 @@ class DatabaseImporter:
             if not csv_path.exists():
                 missing.append(csv_file)
                 self.logger.error(f"Missing CSV: {csv_file}")
-            else:
+            elif csv_path.stat().st_size == 0:
                 # Check if file is empty
-                df = pd.read_csv(csv_path, nrows=0)
-                self.logger.info(f"{csv_file} - Columns: {list(df.columns)}")
+                missing.append(csv_file)
+                self.logger.error(f"Empty CSV: {csv_file}")
+            elif self.logger.isEnabledFor(logging.DEBUG):
+                # Parsing the header is only worth it when it gets logged
+                self.logger.debug(f"{csv_file} - Columns: {self._header(csv_file)}")
         
         if missing:
-            self.logger.error(f"Missing {len(missing)} CSV file(s)")
+            self.logger.error(f"Missing or empty: {len(missing)} CSV file(s)")
             return False
         
         self.logger.info("All CSV files validated successfully")
         return True
     
+    def _header(self, csv_file: str) -> List[str]:
+        """Column names of a CSV, reading its header at most once"""
+        if csv_file not in self._headers:
+            self._headers[csv_file] = list(pd.read_csv(self.csv_dir / csv_file, nrows=0).columns)
+        return self._headers[csv_file]
+    
+    def _keys(self, csv_file: str, column: str) -> pd.Index:
+        """Distinct values of a KEY_COLUMNS column, reading each CSV at most once
+        
+        Kept as an Index so the validators diff them with hash tables over the
+        int64 arrays instead of boxing every id into a Python set.
+        """
+        if csv_file not in self._key_values:
+            self._key_values[csv_file] = self._read_keys(csv_file)
+        return self._key_values[csv_file][column]
+    
+    def _read_keys(self, csv_file: str) -> Dict[str, pd.Index]:
+        """Read the KEY_COLUMNS of one CSV as an Index of distinct values per column"""
+        df = pd.read_csv(
+            self.csv_dir / csv_file, usecols=KEY_COLUMNS[csv_file], dtype=ID_DTYPES
+        )
+        return {col: pd.Index(df[col].unique()) for col in KEY_COLUMNS[csv_file]}
+    
+    def _prefetch_keys(self):
+        """Read the key columns of every CSV validation needs, several files at a time
+        
+        read_csv's C parser releases the GIL while it tokenizes, so threads
+        overlap the parsing as well as the file I/O.
+        """
+        pending = [csv_file for csv_file in KEY_COLUMNS if csv_file not in self._key_values]
+        if not pending:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+            for csv_file, keys in zip(pending, executor.map(self._read_keys, pending)):
+                self._key_values[csv_file] = keys
+    
+    def _iter_csv(self, csv_file: str, columns: List[str]) -> Iterator[List[list]]:
+        """Stream columns of a CSV with pyarrow, as value lists per parsed block
+        
+        Each block is one plain Python list per column, in the order given.
+        ID_DTYPES columns hold ints and the rest the text in the file; cells
+        read_csv treats as missing come back as '', so nothing has to be filled afterwards.
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        
+        reader = pacsv.open_csv(
+            self.csv_dir / csv_file,
+            # Quoted cells can span lines, e.g. multi-paragraph attestations
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={
+                    col: pa.int64() if col in ID_DTYPES else pa.string() for col in columns
+                },
+                # pyarrow's missing-value markers lack two of read_csv's
+                null_values=[*pacsv.ConvertOptions().null_values, 'None', '<NA>'],
+                strings_can_be_null=True
+            )
+        )
+        # Arrow converts whole columns to Python values, with no DataFrame in between
+        for batch in reader:
+            block = []
+            for array in batch.columns:
+                if array.type == pa.string():
+                    block.append(array.fill_null('').to_pylist())
+                elif array.null_count:
+                    block.append(['' if value is None else value for value in array.to_pylist()])
+                else:
+                    block.append(array.to_pylist())
+            yield block
+    
     def _validate_foreign_keys_themes(self) -> Tuple[bool, List[str]]:
         """Validate that all theme_slug values in entry_themes exist in themes"""
-        entry_themes_df = pd.read_csv(self.csv_dir / 'entry_themes.csv')
-        themes_df = pd.read_csv(self.csv_dir / 'themes.csv')
-        
         # Get unique slugs from entry_themes
-        entry_slugs = set(entry_themes_df['theme_slug'].unique())
-        theme_slugs = set(themes_df['slug'].unique())
+        entry_slugs = self._keys('entry_themes.csv', 'theme_slug')
+        theme_slugs = self._keys('themes.csv', 'slug')
         
         # Find missing slugs
-        missing_slugs = entry_slugs - theme_slugs
+        missing_slugs = entry_slugs.difference(theme_slugs)
         
-        if missing_slugs:
-            return False, list(missing_slugs)
+        if len(missing_slugs):
+            return False, missing_slugs.tolist()
         
         return True, []
     
     def _validate_foreign_keys_entry_themes(self) -> Tuple[bool, List[int]]:
         """Validate that all entry_node_id in entry_themes exist in dictionary_entries"""
-        entry_themes_df = pd.read_csv(self.csv_dir / 'entry_themes.csv')
-        entries_df = pd.read_csv(self.csv_dir / 'dictionary_entries.csv')
-        
-        entry_ids = set(entry_themes_df['entry_node_id'].unique())
-        valid_ids = set(entries_df['node_id'].unique())
+        entry_ids = self._keys('entry_themes.csv', 'entry_node_id')
+        valid_ids = self._keys('dictionary_entries.csv', 'node_id')
         
-        missing_ids = entry_ids - valid_ids
+        missing_ids = entry_ids.difference(valid_ids)
         
-        if missing_ids:
-            return False, list(missing_ids)
+        if len(missing_ids):
+            return False, missing_ids.tolist()
         
         return True, []
     
     def _validate_foreign_keys_entry_audio(self) -> Tuple[bool, Dict[str, List[int]]]:
         """Validate foreign keys for entry_audio table"""
-        entry_audio_df = pd.read_csv(self.csv_dir / 'entry_audio.csv')
-        entries_df = pd.read_csv(self.csv_dir / 'dictionary_entries.csv')
-        audio_df = pd.read_csv(self.csv_dir / 'audio_files.csv')
-        
         errors = {}
         
         # Check entry_node_id
-        entry_ids = set(entry_audio_df['entry_node_id'].unique())
-        valid_entry_ids = set(entries_df['node_id'].unique())
-        missing_entry_ids = entry_ids - valid_entry_ids
+        entry_ids = self._keys('entry_audio.csv', 'entry_node_id')
+        valid_entry_ids = self._keys('dictionary_entries.csv', 'node_id')
+        missing_entry_ids = entry_ids.difference(valid_entry_ids)
         
-        if missing_entry_ids:
-            errors['missing_entry_ids'] = list(missing_entry_ids)
+        if len(missing_entry_ids):
+            errors['missing_entry_ids'] = missing_entry_ids.tolist()
         
         # Check audio_node_id
-        audio_ids = set(entry_audio_df['audio_node_id'].unique())
-        valid_audio_ids = set(audio_df['node_id'].unique())
-        missing_audio_ids = audio_ids - valid_audio_ids
+        audio_ids = self._keys('entry_audio.csv', 'audio_node_id')
+        valid_audio_ids = self._keys('audio_files.csv', 'node_id')
+        missing_audio_ids = audio_ids.difference(valid_audio_ids)
         
-        if missing_audio_ids:
-            errors['missing_audio_ids'] = list(missing_audio_ids)
+        if len(missing_audio_ids):
+            errors['missing_audio_ids'] = missing_audio_ids.tolist()
         
         if errors:
             return False, errors
@@ -207,31 +326,25 @@ class DatabaseImporter:
     
     def _validate_foreign_keys_attestations(self) -> Tuple[bool, List[int]]:
         """Validate that all node_id in attestations exist in dictionary_entries"""
-        attestations_df = pd.read_csv(self.csv_dir / 'attestations.csv')
-        entries_df = pd.read_csv(self.csv_dir / 'dictionary_entries.csv')
-        
-        attest_ids = set(attestations_df['node_id'].unique())
-        valid_ids = set(entries_df['node_id'].unique())
+        attest_ids = self._keys('attestations.csv', 'node_id')
+        valid_ids = self._keys('dictionary_entries.csv', 'node_id')
         
-        missing_ids = attest_ids - valid_ids
+        missing_ids = attest_ids.difference(valid_ids)
         
-        if missing_ids:
-            return False, list(missing_ids)
+        if len(missing_ids):
+            return False, missing_ids.tolist()
         
         return True, []
     
     def _validate_foreign_keys_citations(self) -> Tuple[bool, List[int]]:
         """Validate that all node_id in authority_citations exist in dictionary_entries"""
-        citations_df = pd.read_csv(self.csv_dir / 'authority_citations.csv')
-        entries_df = pd.read_csv(self.csv_dir / 'dictionary_entries.csv')
+        citation_ids = self._keys('authority_citations.csv', 'node_id')
+        valid_ids = self._keys('dictionary_entries.csv', 'node_id')
         
-        citation_ids = set(citations_df['node_id'].unique())
-        valid_ids = set(entries_df['node_id'].unique())
+        missing_ids = citation_ids.difference(valid_ids)
         
-        missing_ids = citation_ids - valid_ids
-        
-        if missing_ids:
-            return False, list(missing_ids)
+        if len(missing_ids):
+            return False, missing_ids.tolist()
         
         return True, []
     
@@ -241,6 +354,8 @@ class DatabaseImporter:
         self.logger.info("VALIDATING FOREIGN KEY RELATIONSHIPS")
         self.logger.info("=" * 70)
         
+        self._prefetch_keys()
+        
         all_valid = True
         
         # 1. Validate theme_slug  themes.slug
@@ -298,102 +413,120 @@ class DatabaseImporter:
         self.logger.info("Foreign key validation PASSED")
         return True
     
+    def create_indexes(self) -> None:
+        """Build the indexes create_database held back, inside the open import transaction"""
+        if self.conn is None:
+            return
+        
+        self.logger.info(f"Creating {len(self._deferred_indexes)} indexes...")
+        
+        for statement in self._deferred_indexes:
+            self.conn.execute(statement)
+        self._deferred_indexes = []
+        
+        self.logger.info(" Indexes created")
+    
+    def _bulk_insert(self, table: str, df: pd.DataFrame) -> None:
+        """Insert every row of df into table, matching columns by name"""
+        self._insert_rows(table, list(df.columns), df.itertuples(index=False, name=None))
+    
+    def _insert_rows(self, table: str, columns: List[str], rows: Iterable[tuple]) -> None:
+        """Insert row tuples holding the given columns into table
+        
+        Rows go in INSERT_BATCH_ROWS at a time as one multi-row VALUES statement,
+        so SQLite steps one statement per batch rather than one per row.
+        """
+        if self.conn is None:
+            return
+        
+        column_list = ", ".join(f'"{col}"' for col in columns)
+        row_placeholders = "(" + ", ".join("?" * len(columns)) + ")"
+        sql = f"INSERT INTO {table} ({column_list}) VALUES {row_placeholders}"
+        
+        batch_rows = max(1, min(
+            INSERT_BATCH_ROWS,
+            self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // len(columns)
+        ))
+        batch_sql = sql + (", " + row_placeholders) * (batch_rows - 1)
+        
+        # Rows are bound as plain Python values inside the open import transaction
+        rows = iter(rows)
+        for batch in iter(lambda: list(islice(rows, batch_rows)), []):
+            if len(batch) == batch_rows:
+                self.conn.execute(batch_sql, list(chain.from_iterable(batch)))
+            else:
+                # Last, partial batch
+                self.conn.executemany(sql, batch)
+    
+    def _import_csv(self, table: str, csv_file: str, columns: List[str]) -> int:
+        """Stream the given columns of csv_file into table, returning the row count"""
+        imported = 0
+        for block in self._iter_csv(csv_file, columns):
+            # Missing cells already read as empty strings
+            self._insert_rows(table, columns, zip(*block))
+            imported += len(block[0])
+        return imported
+    
     def import_themes(self) -> None:
         """Import themes table"""
         self.logger.info("Importing themes...")
         
-        df = pd.read_csv(self.csv_dir / 'themes.csv')
-        
-        # Drop extra columns not in schema
+        # Only read the columns in the schema
         columns_to_keep = ['tid', 'name', 'slug', 'description', 'vocabulary_id']
-        df = df[columns_to_keep]
-        
-        # Replace NaN with empty string
-        df = df.fillna('')
-        
-        # Import to database
-        df.to_sql('themes', self.conn, if_exists='append', index=False)
+        imported = self._import_csv('themes', 'themes.csv', columns_to_keep)
         
-        self.stats['themes']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} themes")
+        self.stats['themes']['imported'] = imported
+        self.logger.info(f" Imported {imported} themes")
     
     def import_audio_files(self) -> None:
         """Import audio_files table"""
         self.logger.info("Importing audio_files...")
         
-        df = pd.read_csv(self.csv_dir / 'audio_files.csv')
-        
-        # Drop extra columns not in schema
+        # Only read the columns in the schema
         columns_to_keep = [
             'node_id', 'headword', 'file_wav', 'file_mp3', 'file_aif',
             'speaker', 'date_recorded', 'url_alias', 'scrape_timestamp'
         ]
-        df = df[columns_to_keep]
-        
-        # Replace NaN with empty string
-        df = df.fillna('')
+        imported = self._import_csv('audio_files', 'audio_files.csv', columns_to_keep)
         
-        # Import to database
-        df.to_sql('audio_files', self.conn, if_exists='append', index=False)
-        
-        self.stats['audio_files']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} audio files")
+        self.stats['audio_files']['imported'] = imported
+        self.logger.info(f" Imported {imported} audio files")
     
     def import_dictionary_entries(self) -> None:
         """Import dictionary_entries table"""
         self.logger.info("Importing dictionary_entries...")
         
-        df = pd.read_csv(self.csv_dir / 'dictionary_entries.csv')
-        
-        # Drop any empty trailing columns
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-        
-        # Replace NaN with empty string
-        df = df.fillna('')
+        # Skip any empty trailing columns
+        columns_to_keep = [
+            col for col in self._header('dictionary_entries.csv') if not col.startswith('Unnamed')
+        ]
         
-        # Import to database
-        df.to_sql('dictionary_entries', self.conn, if_exists='append', index=False)
+        imported = self._import_csv('dictionary_entries', 'dictionary_entries.csv', columns_to_keep)
         
-        self.stats['dictionary_entries']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} dictionary entries")
+        self.stats['dictionary_entries']['imported'] = imported
+        self.logger.info(f" Imported {imported} dictionary entries")
     
     def import_attestations(self) -> None:
         """Import attestations table"""
         self.logger.info("Importing attestations...")
         
-        df = pd.read_csv(self.csv_dir / 'attestations.csv')
-        
         # Don't include 'id' column (AUTOINCREMENT)
         columns_to_keep = ['node_id', 'language', 'attestation_text', 'source_field']
-        df = df[columns_to_keep]
+        imported = self._import_csv('attestations', 'attestations.csv', columns_to_keep)
         
-        # Replace NaN with empty string
-        df = df.fillna('')
-        
-        # Import to database
-        df.to_sql('attestations', self.conn, if_exists='append', index=False)
-        
-        self.stats['attestations']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} attestations")
+        self.stats['attestations']['imported'] = imported
+        self.logger.info(f" Imported {imported} attestations")
     
     def import_authority_citations(self) -> None:
         """Import authority_citations table"""
         self.logger.info("Importing authority_citations...")
         
-        df = pd.read_csv(self.csv_dir / 'authority_citations.csv')
-        
         # Don't include 'id' column (AUTOINCREMENT)
         columns_to_keep = ['node_id', 'authority_name', 'citation_text', 'citation_order']
-        df = df[columns_to_keep]
-        
-        # Replace NaN with empty string
-        df = df.fillna('')
-        
-        # Import to database
-        df.to_sql('authority_citations', self.conn, if_exists='append', index=False)
+        imported = self._import_csv('authority_citations', 'authority_citations.csv', columns_to_keep)
         
-        self.stats['authority_citations']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} authority citations")
+        self.stats['authority_citations']['imported'] = imported
+        self.logger.info(f" Imported {imported} authority citations")
     
     def import_entry_themes(self) -> None:
         """
@@ -402,54 +535,64 @@ class DatabaseImporter:
         """
         self.logger.info("Importing entry_themes...")
         
-        df = pd.read_csv(self.csv_dir / 'entry_themes.csv')
-        
-        # Get theme slug  tid mapping from database
         if self.conn is None:
             return
-        cursor = self.conn.execute("SELECT tid, slug FROM themes")
-        slug_to_tid = {row[1]: row[0] for row in cursor.fetchall()}
-        
-        # Map slug to tid
-        df['theme_tid'] = df['theme_slug'].map(slug_to_tid)
-        
-        # Check for any unmapped slugs (should not happen if validation passed)
-        unmapped = df[df['theme_tid'].isna()]
-        if not unmapped.empty:
-            self.logger.error(f"Found {len(unmapped)} unmapped theme slugs")
-            raise ValueError("Unmapped theme slugs found after validation")
         
-        # Select only columns for database
-        columns_to_keep = ['entry_node_id', 'theme_tid', 'delta']
-        df = df[columns_to_keep]
-        
-        # Convert theme_tid to int
-        df['theme_tid'] = df['theme_tid'].astype(int)
+        # Load the CSV as is into a temp table; slugs are mapped to tids by
+        # joining against the themes already imported
+        self.conn.execute("""
+            CREATE TEMP TABLE temp_entry_themes (
+                entry_node_id INTEGER,
+                theme_slug TEXT,
+                delta INTEGER
+            )
+        """)
         
-        # Import to database
-        df.to_sql('entry_themes', self.conn, if_exists='append', index=False)
+        try:
+            chunks = pd.read_csv(
+                self.csv_dir / 'entry_themes.csv',
+                usecols=['entry_node_id', 'theme_slug', 'delta'],
+                dtype=ID_DTYPES,
+                chunksize=READ_CHUNKSIZE
+            )
+            for df in chunks:
+                self._bulk_insert('temp_entry_themes', df)
+            
+            # Check for any unmapped slugs (should not happen if validation passed)
+            unmapped = self.conn.execute("""
+                SELECT COUNT(*) FROM temp_entry_themes e
+                LEFT JOIN themes t ON t.slug = e.theme_slug
+                WHERE t.tid IS NULL
+            """).fetchone()[0]
+            if unmapped:
+                self.logger.error(f"Found {unmapped} unmapped theme slugs")
+                raise ValueError("Unmapped theme slugs found after validation")
+            
+            # Import to database, in CSV order
+            cursor = self.conn.execute("""
+                INSERT INTO entry_themes (entry_node_id, theme_tid, delta)
+                SELECT e.entry_node_id, t.tid, e.delta
+                FROM temp_entry_themes e
+                JOIN themes t ON t.slug = e.theme_slug
+                ORDER BY e.rowid
+            """)
+            imported = cursor.rowcount
+        finally:
+            self.conn.execute("DROP TABLE temp_entry_themes")
         
-        self.stats['entry_themes']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} entry-theme relationships")
+        self.stats['entry_themes']['imported'] = imported
+        self.logger.info(f" Imported {imported} entry-theme relationships")
     
     def import_entry_audio(self) -> None:
         """Import entry_audio table"""
         self.logger.info("Importing entry_audio...")
         
-        df = pd.read_csv(self.csv_dir / 'entry_audio.csv')
-        
         # Columns match schema exactly
         columns_to_keep = ['entry_node_id', 'audio_node_id', 'reference_type', 'delta']
-        df = df[columns_to_keep]
+        imported = self._import_csv('entry_audio', 'entry_audio.csv', columns_to_keep)
         
-        # Replace NaN with empty string
-        df = df.fillna('')
-        
-        # Import to database
-        df.to_sql('entry_audio', self.conn, if_exists='append', index=False)
-        
-        self.stats['entry_audio']['imported'] = len(df)
-        self.logger.info(f" Imported {len(df)} entry-audio relationships")
+        self.stats['entry_audio']['imported'] = imported
+        self.logger.info(f" Imported {imported} entry-audio relationships")
     
     def verify_data_integrity(self) -> bool:
         """Verify data integrity after import"""
@@ -578,14 +721,28 @@ class DatabaseImporter:
             else:
                 self.logger.warning("Skipping foreign key validation (not recommended)")
             
-            # Step 3: Create fresh database
-            self.create_database(fresh=True)
+            # Step 3: Create fresh database, indexes built after the import
+            self.create_database(fresh=True, defer_indexes=True)
             
             # Step 4: Connect to database
             self.conn = sqlite3.connect(self.db_path)
-            self.conn.execute("PRAGMA foreign_keys = ON")
+            
+            # Foreign keys are checked once over the loaded tables instead of
+            # probing the parent tables on every insert; the pragma is a no-op
+            # inside a transaction, so it is set before BEGIN
+            self.conn.execute("PRAGMA foreign_keys = OFF")
+            
+            # Bulk-load settings: the database is rebuilt from the CSVs on every
+            # run, so an interrupted import only costs a rerun
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = OFF")
+            self.conn.execute("PRAGMA temp_store = MEMORY")
+            self.conn.execute("PRAGMA cache_size = -200000")
             
             try:
+                # One transaction for the whole import, committed once below
+                self.conn.execute("BEGIN")
+                
                 # Step 5: Import data in order (respecting foreign keys)
                 self.logger.info("\n" + "=" * 70)
                 self.logger.info("IMPORTING DATA")
@@ -599,9 +756,21 @@ class DatabaseImporter:
                 self.import_entry_themes()
                 self.import_entry_audio()
                 
+                self.create_indexes()
+                
+                # Nothing is committed if a row points at a missing parent,
+                # as when the constraints were enforced per insert
+                violations = self.conn.execute("PRAGMA foreign_key_check").fetchall()
+                if violations:
+                    self.logger.error(f"Foreign key constraint violations: {len(violations)}")
+                    for violation in violations[:10]:  # Show first 10
+                        self.logger.error(f"  {violation}")
+                    raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+                
                 # Commit transaction
                 self.conn.commit()
                 self.logger.info("\nAll data committed to database")
+                self.conn.execute("PRAGMA foreign_keys = ON")
                 
                 # Step 6: Verify data integrity
                 if not self.verify_data_integrity():
@@ -659,6 +828,11 @@ def main():
         action='store_true',
         help='Skip foreign key validation (not recommended)'
     )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Also log debug details, such as the columns of each CSV'
+    )
     
     args = parser.parse_args()
     
@@ -668,6 +842,8 @@ def main():
         csv_dir=args.csv_dir,
         schema_path=args.schema
     )
+    if args.verbose:
+        importer.logger.setLevel(logging.DEBUG)
     
     # Run import
     success = importer.run_import_pipeline(skip_validation=args.skip_validation)
@@ -4,14 +4,19 @@ Scrapes /dictionary pagination to build master node inventory
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
 import time
 import logging
-from typing import List, Optional, Dict
-from dataclasses import dataclass, asdict
+import threading
+from typing import Iterable, List, Optional, Dict, Set
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-import pandas as pd
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter
 import csv
 
 
@@ -31,6 +36,170 @@ class NodeInventoryEntry:
     scrape_timestamp: str
 
 
+INVENTORY_FIELDS = [f.name for f in fields(NodeInventoryEntry)]
+
+# Column types for the Parquet copy of the inventory, in INVENTORY_FIELDS order
+INVENTORY_ARROW_TYPES = {
+    'node_id': 'int64',
+    'url_alias': 'string',
+    'title': 'string',
+    'wordorparticle': 'string',
+    'head_idiez': 'string',
+    'has_translation1': 'bool',
+    'has_ndef_idiez': 'bool',
+    'has_eshort_idiez': 'bool',
+    'source_dataset': 'string',
+    'page_number': 'int32',
+    'scrape_timestamp': 'string'
+}
+
+# Checkpoints are rewritten in place as one fixed-width record
+CHECKPOINT_WIDTH = 16
+
+
+@dataclass
+class InventoryStats:
+    """Running summary statistics, updated as inventory entries are written"""
+    total_entries: int = 0
+    by_source: Counter = field(default_factory=Counter)
+    with_url_alias: int = 0
+    with_translation1: int = 0
+    with_ndef_idiez: int = 0
+    with_eshort_idiez: int = 0
+    node_ids: Set[int] = field(default_factory=set)
+    pages: Set[int] = field(default_factory=set)
+    
+    def add(self, entries: Iterable[NodeInventoryEntry]):
+        """Count a batch of entries"""
+        for entry in entries:
+            self.total_entries += 1
+            self.by_source[entry.source_dataset] += 1
+            self.with_url_alias += entry.url_alias != ''
+            self.with_translation1 += entry.has_translation1
+            self.with_ndef_idiez += entry.has_ndef_idiez
+            self.with_eshort_idiez += entry.has_eshort_idiez
+            if entry.node_id is not None:
+                self.node_ids.add(entry.node_id)
+            self.pages.add(entry.page_number)
+    
+    def to_dict(self) -> Dict:
+        """Summary in the format of DictionaryEnumerator.generate_summary_report"""
+        return {
+            'total_entries': self.total_entries,
+            'unique_node_ids': len(self.node_ids),
+            'by_source': dict(self.by_source.most_common()),
+            'with_url_alias': self.with_url_alias,
+            'with_translation1': self.with_translation1,
+            'with_ndef_idiez': self.with_ndef_idiez,
+            'with_eshort_idiez': self.with_eshort_idiez,
+            'pages_scraped': len(self.pages),
+            'duplicate_node_ids': self.total_entries - len(self.node_ids)
+        }
+
+
+def _parse_node_id_from_url(url: str) -> Optional[int]:
+    """Extract node ID from /node/XXXXX URL"""
+    if not url:
+        return None
+    if url.startswith('/node/'):
+        try:
+            return int(url.replace('/node/', ''))
+        except ValueError:
+            return None
+    return None
+
+
+def _classify_source_dataset(
+    has_wordorparticle: bool,
+    has_head_idiez: bool
+) -> str:
+    """Determine if entry is WHP, IDIEZ, or HYBRID"""
+    if has_wordorparticle and has_head_idiez:
+        return 'HYBRID'
+    elif has_head_idiez:
+        return 'IDIEZ'
+    elif has_wordorparticle:
+        return 'WHP'
+    else:
+        return 'UNKNOWN'
+
+
+def _cell_text(cell) -> str:
+    """Stripped text of a table cell, '' if the row has no such cell"""
+    return cell.text().strip() if cell else ''
+
+
+def parse_page_rows(html: bytes, page_num: int) -> Optional[List[Dict]]:
+    """
+    Extract inventory rows (NodeInventoryEntry fields) from the HTML of one dictionary page,
+    None if the page has no table rows. Module level so it can run in a worker process
+    """
+    tree = LexborHTMLParser(html)
+    entries = []
+    
+    # Find all table rows (skip header)
+    rows = tree.css('table.views-table tbody tr')
+    
+    if not rows:
+        return None
+    
+    for row in rows:
+        # Index the row's cells by their views-field-* class in one pass
+        cells = {}
+        for cell in row.iter():
+            if cell.tag != 'td':
+                continue
+            for cls in (cell.attributes.get('class') or '').split():
+                if cls.startswith('views-field-'):
+                    cells.setdefault(cls, cell)
+    
+        # Extract title cell (contains node link)
+        title_td = cells.get('views-field-title')
+        title_cell = title_td.css_first('a') if title_td else None
+        if not title_cell:
+            continue
+    
+        node_url = title_cell.attributes.get("href") or ""
+        node_id = _parse_node_id_from_url(node_url)
+        title = title_cell.text().strip()
+    
+        # Extract URL alias (might be /content/... or /node/...)
+        url_alias = node_url if node_url.startswith('/content/') else ''
+    
+        # Get text values from other columns
+        wordorparticle = _cell_text(cells.get('views-field-field-wordorparticle'))
+        head_idiez = _cell_text(cells.get('views-field-field-head-idiez'))
+    
+        # Check if fields have content (not just whitespace)
+        has_translation1 = bool(_cell_text(cells.get('views-field-field-translation1')))
+        has_ndef_idiez = bool(_cell_text(cells.get('views-field-field-ndef-idiez')))
+        has_eshort_idiez = bool(_cell_text(cells.get('views-field-field-eshort-idiez')))
+    
+        # Classify source dataset
+        source_dataset = _classify_source_dataset(
+            bool(wordorparticle),
+            bool(head_idiez)
+        )
+    
+        entry = dict(
+            node_id=node_id,
+            url_alias=url_alias,
+            title=title,
+            wordorparticle=wordorparticle,
+            head_idiez=head_idiez,
+            has_translation1=has_translation1,
+            has_ndef_idiez=has_ndef_idiez,
+            has_eshort_idiez=has_eshort_idiez,
+            source_dataset=source_dataset,
+            page_number=page_num,
+            scrape_timestamp=datetime.now().isoformat()
+        )
+    
+        entries.append(entry)
+    
+    return entries
+
+
 class DictionaryEnumerator:
     """Enumerate all dictionary entries from paginated table view"""
     
@@ -38,10 +207,19 @@ class DictionaryEnumerator:
         self,
         base_url: str = "https://nahuatl.wired-humanities.org/dictionary",
         delay_seconds: float = 0.5,
-        output_dir: str = "data/interim"
+        output_dir: str = "data/interim",
+        workers: int = 8,
+        parse_workers: Optional[int] = None,
+        http_cache: Optional[str] = None
     ):
         self.base_url = base_url
         self.delay_seconds = delay_seconds
+        self.workers = workers
+        # Processes parsing pages during enumerate_all_entries (None: CPU count, 1: parse in the fetch threads)
+        self.parse_workers = parse_workers
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # SQLite file caching page responses across runs, None to always hit the site
+        self.http_cache = http_cache
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -50,17 +228,68 @@ class DictionaryEnumerator:
         
         # Progress tracking
         self.checkpoint_file = self.output_dir / "enumeration_checkpoint.txt"
+        self._checkpoint_fd: Optional[int] = None
+        
+        # Pages still failing after retries, appended to the file as they fail so an
+        # interrupted run keeps them for replay with --pages-from
+        self.failed_pages_file = self.output_dir / "failed_pages.txt"
+        self.failed_pages: List[int] = []
+        self._failed_lock = threading.Lock()
+        
+        # Request starts are spaced delay_seconds apart across all worker threads
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
         
     def _setup_session(self) -> requests.Session:
         """Configure requests session"""
-        session = requests.Session()
+        if self.http_cache:
+            # Only needed when a cache is asked for
+            from requests_cache import CachedSession
+            session = CachedSession(
+                cache_name=self.http_cache,
+                backend='sqlite',
+                expire_after=86400,
+                allowable_methods=('GET',)
+            )
+        else:
+            session = requests.Session()
         session.headers.update({
             "User-Agent": "Mozilla/5.0 (compatible; NahuatLEX-Enumerator/1.0)",
             "Accept": "text/html,application/xhtml+xml",
             "Accept-Language": "en-US,en;q=0.5",
         })
+        
+        # One pooled connection per fetch worker, transient errors retried with backoff
+        adapter = HTTPAdapter(
+            pool_connections=self.workers,
+            pool_maxsize=self.workers,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504)
+            )
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         return session
     
+    def _wait_for_request_slot(self):
+        """Block until this thread may start a request, keeping the overall rate polite"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self.delay_seconds
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _is_cached(self, url: str) -> bool:
+        """Whether the cache holds an unexpired response for url, which get() serves without a request"""
+        if not self.http_cache:
+            return False
+        cache = self.session.cache # type: ignore
+        cached = cache.get_response(cache.create_key(requests.Request('GET', url).prepare()))
+        return cached is not None and not cached.is_expired
+    
     def _setup_logger(self) -> logging.Logger:
         """Configure logging"""
         logging.basicConfig(
@@ -69,112 +298,72 @@ class DictionaryEnumerator:
         )
         return logging.getLogger(__name__)
     
-    def _parse_node_id_from_url(self, url: str) -> Optional[int]:
-        """Extract node ID from /node/XXXXX URL"""
-        if not url:
-            return None
-        if url.startswith('/node/'):
-            try:
-                return int(url.replace('/node/', ''))
-            except ValueError:
-                return None
-        return None
-    
-    def _classify_source_dataset(
-        self,
-        has_wordorparticle: bool,
-        has_head_idiez: bool
-    ) -> str:
-        """Determine if entry is WHP, IDIEZ, or HYBRID"""
-        if has_wordorparticle and has_head_idiez:
-            return 'HYBRID'
-        elif has_head_idiez:
-            return 'IDIEZ'
-        elif has_wordorparticle:
-            return 'WHP'
-        else:
-            return 'UNKNOWN'
-    
-    def parse_dictionary_page(self, page_num: int) -> List[NodeInventoryEntry]:
-        """Parse a single page of the dictionary table"""
+    def fetch_page(self, page_num: int) -> Optional[bytes]:
+        """Download a single page of the dictionary table, None if the request fails"""
         url = f"{self.base_url}?page={page_num}"
         
         try:
+            # Cached pages never reach the site, so they skip the rate limit
+            if not self._is_cached(url):
+                self._wait_for_request_slot()
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            entries = []
-            
-            # Find all table rows (skip header)
-            rows = soup.select('table.views-table tbody tr')
-            
-            if not rows:
-                self.logger.warning(f"No rows found on page {page_num}")
-                return []
-            
-            for row in rows:
-                # Extract title cell (contains node link)
-                title_cell = row.select_one('td.views-field-title a')
-                if not title_cell:
-                    continue
-                
-                node_url = str(title_cell.get("href") or "")
-                node_id = self._parse_node_id_from_url(node_url)
-                title = title_cell.text.strip()
-                
-                # Extract URL alias (might be /content/... or /node/...)
-                url_alias = node_url if node_url.startswith('/content/') else ''
-                
-                # Extract field values from other columns
-                wordorparticle_cell = row.select_one('td.views-field-field-wordorparticle')
-                head_idiez_cell = row.select_one('td.views-field-field-head-idiez')
-                translation1_cell = row.select_one('td.views-field-field-translation1')
-                ndef_idiez_cell = row.select_one('td.views-field-field-ndef-idiez')
-                eshort_idiez_cell = row.select_one('td.views-field-field-eshort-idiez')
-                
-                # Get text values
-                wordorparticle = wordorparticle_cell.text.strip() if wordorparticle_cell else ''
-                head_idiez = head_idiez_cell.text.strip() if head_idiez_cell else ''
-                
-                # Check if fields have content (not just whitespace)
-                has_translation1 = bool(translation1_cell and translation1_cell.text.strip())
-                has_ndef_idiez = bool(ndef_idiez_cell and ndef_idiez_cell.text.strip())
-                has_eshort_idiez = bool(eshort_idiez_cell and eshort_idiez_cell.text.strip())
-                
-                # Classify source dataset
-                source_dataset = self._classify_source_dataset(
-                    bool(wordorparticle),
-                    bool(head_idiez)
-                )
-                
-                entry = NodeInventoryEntry(
-                    node_id=node_id,
-                    url_alias=url_alias,
-                    title=title,
-                    wordorparticle=wordorparticle,
-                    head_idiez=head_idiez,
-                    has_translation1=has_translation1,
-                    has_ndef_idiez=has_ndef_idiez,
-                    has_eshort_idiez=has_eshort_idiez,
-                    source_dataset=source_dataset,
-                    page_number=page_num,
-                    scrape_timestamp=datetime.now().isoformat()
-                )
-                
-                entries.append(entry)
-            
-            self.logger.info(f"Page {page_num}: Extracted {len(entries)} entries")
-            return entries
-            
+            return response.content
         except requests.RequestException as e:
             self.logger.error(f"Failed to fetch page {page_num}: {e}")
+            self.record_failed_page(page_num)
+            return None
+    
+    def record_failed_page(self, page_num: int):
+        """Append a failed page to failed_pages_file straight away, the checkpoint moves past it"""
+        with self._failed_lock:
+            self.failed_pages.append(page_num)
+            with open(self.failed_pages_file, 'a') as f:
+                f.write(f"{page_num}\n")
+    
+    def report_failed_pages(self):
+        """Warn about the pages that failed in this run"""
+        if self.failed_pages:
+            self.logger.warning(
+                f"{len(self.failed_pages)} pages failed, listed in {self.failed_pages_file}; "
+                f"rerun with --pages-from {self.failed_pages_file} to fetch them"
+            )
+            self.failed_pages.clear()
+    
+    def parse_page_html(self, html: bytes, page_num: int) -> List[NodeInventoryEntry]:
+        """Extract inventory entries from one page, in the parse pool when one is running"""
+        if self._parse_pool is not None:
+            rows = self._parse_pool.submit(parse_page_rows, html, page_num).result()
+        else:
+            rows = parse_page_rows(html, page_num)
+        
+        if rows is None:
+            self.logger.warning(f"No rows found on page {page_num}")
+            return []
+        
+        self.logger.info(f"Page {page_num}: Extracted {len(rows)} entries")
+        return [NodeInventoryEntry(**row) for row in rows]
+    
+    def parse_dictionary_page(self, page_num: int) -> List[NodeInventoryEntry]:
+        """Fetch and parse a single page of the dictionary table"""
+        html = self.fetch_page(page_num)
+        if html is None:
             return []
+        return self.parse_page_html(html, page_num)
     
     def save_checkpoint(self, page_num: int):
-        """Save progress checkpoint"""
-        with open(self.checkpoint_file, 'w') as f:
-            f.write(str(page_num))
+        """Save progress checkpoint by overwriting the record on a descriptor kept open"""
+        if self._checkpoint_fd is None:
+            self._checkpoint_fd = os.open(self.checkpoint_file, os.O_RDWR | os.O_CREAT, 0o644)
+        os.lseek(self._checkpoint_fd, 0, os.SEEK_SET)
+        os.write(self._checkpoint_fd, f"{page_num}\n".ljust(CHECKPOINT_WIDTH).encode())
+    
+    def close_checkpoint(self):
+        """Flush the checkpoint to disk and close it"""
+        if self._checkpoint_fd is not None:
+            os.fsync(self._checkpoint_fd)
+            os.close(self._checkpoint_fd)
+            self._checkpoint_fd = None
     
     def load_checkpoint(self) -> int:
         """Load last completed page number"""
@@ -187,97 +376,187 @@ class DictionaryEnumerator:
         self,
         start_page: int = 0,
         end_page: int = 771,
-        resume: bool = True
-    ) -> List[NodeInventoryEntry]:
+        resume: bool = True,
+        filename: str = "node_inventory.csv"
+    ) -> Dict:
         """
-        Enumerate all dictionary entries across all pages
+        Enumerate all dictionary entries across all pages, streaming them to the inventory CSV
         
         Args:
             start_page: First page to scrape (0-indexed)
             end_page: Last page to scrape (inclusive)
-            resume: If True, resume from checkpoint
+            resume: If True, resume from checkpoint and append to the existing inventory
+            filename: Inventory CSV inside output_dir
+            
+        Returns:
+            Summary statistics for the entries written in this run
         """
-        all_entries = []
+        filepath = self.output_dir / filename
+        stats = InventoryStats()
+        append = False
+        self.failed_pages.clear()
         
         # Resume from checkpoint if requested
         if resume:
             checkpoint_page = self.load_checkpoint()
             if checkpoint_page >= start_page:
                 start_page = checkpoint_page + 1
+                append = filepath.exists()
                 self.logger.info(f"Resuming from page {start_page}")
         
-        self.logger.info(f"Starting enumeration: pages {start_page}-{end_page}")
+        self.logger.info(
+            f"Starting enumeration: pages {start_page}-{end_page} ({self.workers} workers)"
+        )
+        
+        pages = range(start_page, end_page + 1)
+        # Rows since the last checkpoint; they are written together with it, so a
+        # resumed run never appends pages that are already in the file
+        pending: List[NodeInventoryEntry] = []
         
-        for page_num in range(start_page, end_page + 1):
-            entries = self.parse_dictionary_page(page_num)
-            all_entries.extend(entries)
+        with open(filepath, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=INVENTORY_FIELDS, lineterminator='\n')
+            if not append:
+                writer.writeheader()
+            
+            def write_pending():
+                writer.writerows(entry.__dict__ for entry in pending)
+                f.flush()
+                stats.add(pending)
+                pending.clear()
             
-            # Save checkpoint every 10 pages
-            if (page_num + 1) % 10 == 0:
-                self.save_checkpoint(page_num)
-                self.logger.info(f"Checkpoint saved at page {page_num}")
+            if self.parse_workers != 1:
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
             
-            # Progress update every 50 pages
-            if (page_num + 1) % 50 == 0:
-                self.logger.info(
-                    f"Progress: {page_num + 1}/{end_page + 1} pages "
-                    f"({len(all_entries)} entries total)"
-                )
+            # Pages are fetched concurrently, but map() yields them in page order,
+            # so every checkpoint covers a contiguous run of completed pages
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    for page_num, entries in zip(pages, executor.map(self.parse_dictionary_page, pages)):
+                        pending.extend(entries)
+                        
+                        # Save checkpoint every 10 pages
+                        if (page_num + 1) % 10 == 0:
+                            write_pending()
+                            self.save_checkpoint(page_num)
+                            self.logger.info(f"Checkpoint saved at page {page_num}")
+                        
+                        # Progress update every 50 pages
+                        if (page_num + 1) % 50 == 0:
+                            self.logger.info(
+                                f"Progress: {page_num + 1}/{end_page + 1} pages "
+                                f"({stats.total_entries + len(pending)} entries total)"
+                            )
+            finally:
+                if self._parse_pool is not None:
+                    self._parse_pool.shutdown()
+                    self._parse_pool = None
             
-            # Rate limiting
-            if page_num < end_page:
-                time.sleep(self.delay_seconds)
+            write_pending()
         
         # Final checkpoint
         self.save_checkpoint(end_page)
+        self.close_checkpoint()
+        
+        self.report_failed_pages()
         
-        return all_entries
+        self._log_saved(stats, filepath)
+        return stats.to_dict()
     
-    def save_inventory(
-        self,
-        entries: List[NodeInventoryEntry],
-        filename: str = "node_inventory.csv"
-    ) -> str:
-        """Save node inventory to CSV"""
+    def replay_pages(self, pages_file: str, filename: str = "node_inventory.csv") -> Dict:
+        """
+        Fetch only the pages listed in pages_file, one number per line, appending
+        their entries to the inventory. The checkpoint is left alone.
+        
+        Replaying failed_pages_file empties it first, so it ends up listing
+        just the pages that fail again.
+        """
+        pages_path = Path(pages_file)
+        pages = sorted({int(line) for line in pages_path.read_text().split()})
+        if pages_path.resolve() == self.failed_pages_file.resolve():
+            pages_path.unlink()
+        
         filepath = self.output_dir / filename
+        stats = InventoryStats()
+        append = filepath.exists()
+        self.failed_pages.clear()
+        
+        self.logger.info(f"Replaying {len(pages)} pages from {pages_file} ({self.workers} workers)")
+        
+        with open(filepath, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=INVENTORY_FIELDS, lineterminator='\n')
+            if not append:
+                writer.writeheader()
+            
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for entries in executor.map(self.parse_dictionary_page, pages):
+                    writer.writerows(entry.__dict__ for entry in entries)
+                    stats.add(entries)
         
-        # Convert to DataFrame for easy CSV writing
-        df = pd.DataFrame([asdict(entry) for entry in entries])
+        self.report_failed_pages()
         
-        # Save to CSV
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        self._log_saved(stats, filepath)
+        return stats.to_dict()
+    
+    def write_parquet(self, csv_path: Path) -> Path:
+        """Write a Parquet copy of an inventory CSV next to it, typed and Snappy-compressed"""
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+        
+        column_types = {name: pa.type_for_alias(alias) for name, alias in INVENTORY_ARROW_TYPES.items()}
+        table = pacsv.read_csv(
+            csv_path,
+            convert_options=pacsv.ConvertOptions(
+                column_types=column_types,
+                # Empty text cells stay '' as in the CSV; only node_id is nullable
+                strings_can_be_null=False
+            )
+        )
         
-        self.logger.info(f"Saved {len(entries)} entries to {filepath}")
+        parquet_path = csv_path.with_suffix('.parquet')
+        pq.write_table(table, parquet_path, compression='snappy')
+        self.logger.info(f"Saved Parquet copy to {parquet_path}")
+        return parquet_path
+    
+    def _log_saved(self, stats: InventoryStats, filepath: Path):
+        """Log where the inventory went and its summary statistics"""
+        self.logger.info(f"Saved {stats.total_entries} entries to {filepath}")
         
         # Print summary statistics
         self.logger.info("\n" + "=" * 70)
         self.logger.info("ENUMERATION SUMMARY")
         self.logger.info("=" * 70)
-        self.logger.info(f"Total entries: {len(entries)}")
-        self.logger.info(f"WHP entries: {len(df[df['source_dataset'] == 'WHP'])}")
-        self.logger.info(f"IDIEZ entries: {len(df[df['source_dataset'] == 'IDIEZ'])}")
-        self.logger.info(f"Hybrid entries: {len(df[df['source_dataset'] == 'HYBRID'])}")
-        self.logger.info(f"Entries with URL aliases: {len(df[df['url_alias'] != ''])}")
-        self.logger.info(f"Unique node IDs: {df['node_id'].nunique()}")
+        self.logger.info(f"Total entries: {stats.total_entries}")
+        self.logger.info(f"WHP entries: {stats.by_source['WHP']}")
+        self.logger.info(f"IDIEZ entries: {stats.by_source['IDIEZ']}")
+        self.logger.info(f"Hybrid entries: {stats.by_source['HYBRID']}")
+        self.logger.info(f"Entries with URL aliases: {stats.with_url_alias}")
+        self.logger.info(f"Unique node IDs: {len(stats.node_ids)}")
+    
+    def save_inventory(
+        self,
+        entries: List[NodeInventoryEntry],
+        filename: str = "node_inventory.csv"
+    ) -> str:
+        """Save an in-memory list of inventory entries to CSV"""
+        filepath = self.output_dir / filename
+        
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=INVENTORY_FIELDS, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(entry.__dict__ for entry in entries)
+        
+        stats = InventoryStats()
+        stats.add(entries)
+        self._log_saved(stats, filepath)
         
         return str(filepath)
     
     def generate_summary_report(self, entries: List[NodeInventoryEntry]) -> Dict:
         """Generate detailed summary statistics"""
-        df = pd.DataFrame([asdict(entry) for entry in entries])
-        
-        return {
-            'total_entries': len(entries),
-            'unique_node_ids': df['node_id'].nunique(),
-            'by_source': df['source_dataset'].value_counts().to_dict(),
-            'with_url_alias': len(df[df['url_alias'] != '']),
-            'with_translation1': df['has_translation1'].sum(),
-            'with_ndef_idiez': df['has_ndef_idiez'].sum(),
-            'with_eshort_idiez': df['has_eshort_idiez'].sum(),
-            'pages_scraped': df['page_number'].nunique(),
-            'duplicate_node_ids': len(df) - df['node_id'].nunique()
-        }
-
+        stats = InventoryStats()
+        stats.add(entries)
+        return stats.to_dict()
 
 def main():
     """Run the dictionary enumeration"""
@@ -303,12 +582,39 @@ def main():
         action='store_true',
         help='Start from beginning, ignore checkpoint'
     )
+    parser.add_argument(
+        '--pages-from',
+        default=None,
+        help='Only fetch the pages listed in this file, e.g. failed_pages.txt, appending them to the inventory'
+    )
     parser.add_argument(
         '--delay',
         type=float,
         default=0.5,
         help='Delay between requests in seconds (default: 0.5)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Pages fetched concurrently (default: 8)'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=None,
+        help='Processes parsing fetched pages, 1 parses in the fetch threads (default: CPU count)'
+    )
+    parser.add_argument(
+        '--http-cache',
+        default=None,
+        help='SQLite file caching page responses for a day, to make re-runs instant (default: no cache)'
+    )
+    parser.add_argument(
+        '--parquet',
+        action='store_true',
+        help='Also write node_inventory.parquet for faster, typed downstream reads'
+    )
     parser.add_argument(
         '--output-dir',
         default='data/interim',
@@ -320,21 +626,24 @@ def main():
     # Create enumerator
     enumerator = DictionaryEnumerator(
         delay_seconds=args.delay,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        parse_workers=args.parse_workers,
+        http_cache=args.http_cache
     )
     
-    # Run enumeration
-    entries = enumerator.enumerate_all_entries(
-        start_page=args.start_page,
-        end_page=args.end_page,
-        resume=not args.no_resume
-    )
-    
-    # Save results
-    filepath = enumerator.save_inventory(entries)
-    
-    # Generate summary
-    summary = enumerator.generate_summary_report(entries)
+    # Run enumeration, writing the inventory as pages complete
+    if args.pages_from:
+        summary = enumerator.replay_pages(args.pages_from)
+    else:
+        summary = enumerator.enumerate_all_entries(
+            start_page=args.start_page,
+            end_page=args.end_page,
+            resume=not args.no_resume
+        )
+    filepath = enumerator.output_dir / "node_inventory.csv"
+    if args.parquet:
+        enumerator.write_parquet(filepath)
     
     print("\n" + "=" * 70)
     print("DETAILED SUMMARY")
@@ -4,14 +4,20 @@ Handles large-scale scraping with checkpoints and recovery
 """
 
 import logging
+import os
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
+import pandas as pd
 
 from node_entry_scraper import NodeEntryScraper
 from csv_exporter import CSVExporter
 
 
+# Checkpoints are rewritten in place as one fixed-width record
+CHECKPOINT_WIDTH = 16
+
+
 class FullScrapeOrchestrator:
     """Orchestrate full dictionary scrape with checkpointing"""
     
@@ -19,7 +25,8 @@ class FullScrapeOrchestrator:
         self,
         inventory_path: str = "data/interim/node_inventory.csv",
         output_dir: str = "data/interim/scraped",
-        checkpoint_interval: int = 500
+        checkpoint_interval: int = 500,
+        workers: int = 8
     ):
         self.inventory_path = inventory_path
         self.output_dir = Path(output_dir)
@@ -27,10 +34,25 @@ class FullScrapeOrchestrator:
         
         self.checkpoint_file = self.output_dir / "scrape_checkpoint.txt"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._checkpoint_fd: Optional[int] = None
         
-        self.scraper = NodeEntryScraper(delay_seconds=0.5)
+        self.scraper = NodeEntryScraper(delay_seconds=0.5, workers=workers)
         self.exporter = CSVExporter(output_dir=str(self.output_dir))
         self.logger = self._setup_logger()
+        
+        # Read once and sliced per batch; only the columns the scraper looks up
+        if Path(self.inventory_path).suffix == '.parquet':
+            self.inventory = pd.read_parquet(
+                self.inventory_path,
+                columns=['node_id', 'url_alias'],
+                dtype_backend='numpy_nullable'
+            )
+        else:
+            self.inventory = pd.read_csv(
+                self.inventory_path,
+                usecols=['node_id', 'url_alias'],
+                dtype={'node_id': 'Int64', 'url_alias': 'string'}
+            )
     
     def _setup_logger(self) -> logging.Logger:
         logging.basicConfig(
@@ -51,9 +73,21 @@ class FullScrapeOrchestrator:
         return 0
     
     def save_checkpoint(self, index: int):
-        """Save progress checkpoint"""
-        with open(self.checkpoint_file, 'w') as f:
-            f.write(str(index))
+        """
+        Save progress checkpoint by overwriting the record on a descriptor kept open.
+        Synced to disk every time, as it is only written once per batch
+        """
+        if self._checkpoint_fd is None:
+            self._checkpoint_fd = os.open(self.checkpoint_file, os.O_RDWR | os.O_CREAT, 0o644)
+        os.lseek(self._checkpoint_fd, 0, os.SEEK_SET)
+        os.write(self._checkpoint_fd, f"{index}\n".ljust(CHECKPOINT_WIDTH).encode())
+        os.fsync(self._checkpoint_fd)
+    
+    def close_checkpoint(self):
+        """Close the checkpoint file"""
+        if self._checkpoint_fd is not None:
+            os.close(self._checkpoint_fd)
+            self._checkpoint_fd = None
     
     def run_full_scrape(self, resume: bool = True):
         """
@@ -64,10 +98,7 @@ class FullScrapeOrchestrator:
         """
         start_index = self.load_checkpoint() if resume else 0
         
-        # Count total entries
-        import pandas as pd
-        df = pd.read_csv(self.inventory_path)
-        total_entries = len(df)
+        total_entries = len(self.inventory)
         
         self.logger.info("=" * 70)
         self.logger.info("FULL DICTIONARY SCRAPE")
@@ -76,7 +107,10 @@ class FullScrapeOrchestrator:
         self.logger.info(f"Starting from index: {start_index}")
         self.logger.info(f"Remaining: {total_entries - start_index}")
         self.logger.info(f"Checkpoint interval: {self.checkpoint_interval}")
-        self.logger.info(f"Estimated time: {(total_entries - start_index) * 0.5 / 3600:.1f} hours")
+        self.logger.info(f"Workers: {self.scraper.workers}")
+        self.logger.info(
+            f"Estimated time: at least {(total_entries - start_index) * self.scraper.delay_seconds / 3600:.1f} hours"
+        )
         self.logger.info("=" * 70)
         
         # Initialize CSV files on first run
@@ -94,7 +128,7 @@ class FullScrapeOrchestrator:
             
             # Scrape batch
             scraped_data = self.scraper.scrape_nodes_from_inventory(
-                inventory_path=self.inventory_path,
+                inventory=self.inventory,
                 start_index=current_index,
                 end_index=batch_end
             )
@@ -113,6 +147,7 @@ class FullScrapeOrchestrator:
             current_index = batch_end
         
         # Final steps
+        self.close_checkpoint()
         self.exporter.save_tracking_files()
         self.exporter.print_statistics()
         
@@ -128,7 +163,7 @@ def main():
     parser.add_argument(
         '--inventory',
         default='data/interim/node_inventory.csv',
-        help='Path to node inventory'
+        help='Path to node inventory (.csv, or .parquet from dictionary_enumerator --parquet)'
     )
     parser.add_argument(
         '--output-dir',
@@ -141,6 +176,12 @@ def main():
         default=500,
         help='Save checkpoint every N entries (default: 500)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Nodes fetched concurrently; requests still start 0.5s apart (default: 8)'
+    )
     parser.add_argument(
         '--no-resume',
         action='store_true',
@@ -152,7 +193,8 @@ def main():
     orchestrator = FullScrapeOrchestrator(
         inventory_path=args.inventory,
         output_dir=args.output_dir,
-        checkpoint_interval=args.checkpoint_interval
+        checkpoint_interval=args.checkpoint_interval,
+        workers=args.workers
     )
     
     orchestrator.run_full_scrape(resume=not args.no_resume)
@@ -5,8 +5,11 @@ Outputs data in normalized format for SQLite import
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, cast
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -102,13 +105,20 @@ class NodeEntryScraper:
         self,
         delay_seconds: float = 0.5,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        workers: int = 1
     ):
         self.delay_seconds = delay_seconds
         self.timeout = timeout
         self.max_retries = max_retries
+        # Nodes fetched concurrently by scrape_nodes_from_inventory
+        self.workers = workers
         self.session = self._setup_session()
         self.logger = self._setup_logger()
+        
+        # Request starts are spaced delay_seconds apart across all worker threads
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
     
     def _setup_session(self) -> requests.Session:
         """Configure requests session"""
@@ -117,8 +127,22 @@ class NodeEntryScraper:
             "User-Agent": "Mozilla/5.0 (compatible; NahuatLEX-NodeScraper/1.0)",
             "Accept": "text/html,application/xhtml+xml",
         })
+        
+        # Keep a pooled connection for every worker thread
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=max(self.workers, 10))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         return session
     
+    def _wait_for_request_slot(self):
+        """Block until this thread may start a request, keeping the overall rate polite"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self.delay_seconds
+        if wait > 0:
+            time.sleep(wait)
+    
     def _setup_logger(self) -> logging.Logger:
         """Configure logging"""
         logging.basicConfig(
@@ -350,6 +374,7 @@ class NodeEntryScraper:
         
         for attempt in range(self.max_retries):
             try:
+                self._wait_for_request_slot()
                 response = self.session.get(url, timeout=self.timeout)
                 
                 if response.status_code == 404:
@@ -434,18 +459,25 @@ class NodeEntryScraper:
     
     def scrape_nodes_from_inventory(
         self,
-        inventory_path: str,
+        inventory_path: Optional[str] = None,
         start_index: int = 0,
         end_index: Optional[int] = None,
-        checkpoint_interval: int = 100
+        checkpoint_interval: int = 100,
+        inventory: Optional[pd.DataFrame] = None
     ) -> List[ScrapedNodeData]:
         """
         Scrape nodes from inventory CSV
         
-        Handles both node_id and url_alias entries
+        Handles both node_id and url_alias entries. Pass an already loaded
+        `inventory` to avoid re-reading the CSV for every batch.
         """
         # Load inventory
-        df = pd.read_csv(inventory_path)
+        if inventory is not None:
+            df = inventory
+        elif inventory_path is not None:
+            df = pd.read_csv(inventory_path)
+        else:
+            raise ValueError("Must provide either inventory_path or inventory")
         
         if end_index is None:
             end_index = len(df)
@@ -453,38 +485,49 @@ class NodeEntryScraper:
         df_subset = df.iloc[start_index:end_index]
         total = len(df_subset)
         
-        self.logger.info(f"Scraping {total} nodes (indices {start_index}-{end_index})")
+        self.logger.info(
+            f"Scraping {total} nodes (indices {start_index}-{end_index}, {self.workers} workers)"
+        )
         
         all_scraped_data = []
         
-        for idx, row in df_subset.iterrows():
-            # Use node_id if available, otherwise use url_alias
-            node_id = row['node_id'] if pd.notna(row['node_id']) else None
-            url_alias = row['url_alias'] if pd.notna(row['url_alias']) else None
-            
-            if node_id is not None:
-                scraped = self.scrape_node(node_id=int(node_id))
-            elif url_alias:
-                scraped = self.scrape_node(url_alias=url_alias)
-            else:
-                self.logger.error(f"Row {idx}: No node_id or url_alias available")
-                continue
-            
-            all_scraped_data.append(scraped)
-            
-            # Progress logging
-            progress = len(all_scraped_data)
-            if progress % 50 == 0:
-                self.logger.info(
-                    f"Progress: {progress}/{total} nodes "
-                    f"({progress/total*100:.1f}%)"
-                )
-            
-            # Rate limiting
-            if progress < total:
-                time.sleep(self.delay_seconds)
+        # map() yields results in inventory order; rate limiting happens per request
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                self.scrape_one,
+                df_subset.index,
+                df_subset['node_id'],
+                df_subset['url_alias']
+            )
+            for scraped in results:
+                if scraped is None:
+                    continue
+                
+                all_scraped_data.append(scraped)
+                
+                # Progress logging
+                progress = len(all_scraped_data)
+                if progress % 50 == 0:
+                    self.logger.info(
+                        f"Progress: {progress}/{total} nodes "
+                        f"({progress/total*100:.1f}%)"
+                    )
         
         return all_scraped_data
+    
+    def scrape_one(self, idx, node_id, url_alias) -> Optional[ScrapedNodeData]:
+        """Scrape one inventory row, None if it has neither a node_id nor a url_alias"""
+        # Use node_id if available, otherwise use url_alias
+        node_id = node_id if pd.notna(node_id) else None
+        url_alias = url_alias if pd.notna(url_alias) else None
+        
+        if node_id is not None:
+            return self.scrape_node(node_id=int(node_id))
+        elif url_alias:
+            return self.scrape_node(url_alias=url_alias)
+        
+        self.logger.error(f"Row {idx}: No node_id or url_alias available")
+        return None
 
 
 def main():
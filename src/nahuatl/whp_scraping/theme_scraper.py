@@ -4,19 +4,34 @@ Scrapes theme/taxonomy pages to populate themes table
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
 import time
 import logging
-from typing import List, Optional, Dict
-from dataclasses import dataclass, asdict
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple
+from dataclasses import dataclass, fields
 from pathlib import Path
 import pandas as pd
-from bs4 import BeautifulSoup, Tag
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
 import csv
 import re
 
+# Taxonomy term ID carried as a whole class name, e.g. "page-taxonomy-term-42"
+BODY_TID_RE = re.compile(r"(?:^|\s)page-taxonomy-term-(\d+)(?!\S)")
+TERM_TID_RE = re.compile(r"(?:^|\s)taxonomy-term-(\d+)(?!\S)")
+ENTRY_COUNT_RE = re.compile(r"(\d+)\s+(?:entries|items|results)", re.IGNORECASE)
 
-@dataclass
+# Themes completed between checkpoint saves
+CHECKPOINT_INTERVAL = 50
+
+
+@dataclass(slots=True)
 class ThemeData:
     """Theme/taxonomy term data"""
 
@@ -32,6 +47,29 @@ class ThemeData:
     error_message: str = ""
 
 
+THEME_FIELDS = [f.name for f in fields(ThemeData)]
+
+
+def theme_row(theme: ThemeData) -> Dict:
+    """Shallow field dict of a theme; asdict would deep-copy every value"""
+    return {name: getattr(theme, name) for name in THEME_FIELDS}
+
+
+# Column types for the Parquet copy of scraped themes, in ThemeData field order
+THEME_ARROW_TYPES = {
+    "tid": "int64",
+    "slug": "string",
+    "name": "string",
+    "description": "string",
+    "vocabulary_id": "int32",
+    "entry_count": "int32",
+    "url_alias": "string",
+    "scrape_timestamp": "string",
+    "scrape_status": "string",
+    "error_message": "string",
+}
+
+
 class ThemeScraper:
     """Scrape theme pages from the website"""
 
@@ -42,11 +80,20 @@ class ThemeScraper:
         timeout: int = 30,
         max_retries: int = 3,
         output_dir: str = "data/interim/scraped",
+        workers: int = 1,
+        http_cache: Optional[str] = None,
+        parquet: bool = False,
     ):
         self.base_url = base_url
         self.delay_seconds = delay_seconds
         self.timeout = timeout
         self.max_retries = max_retries
+        # Themes fetched concurrently by scrape_themes_from_file
+        self.workers = workers
+        # SQLite file caching theme pages across runs, None to always hit the site
+        self.http_cache = http_cache
+        # Also write themes to Parquet as they are scraped
+        self.parquet = parquet
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -56,17 +103,79 @@ class ThemeScraper:
         # Progress tracking
         self.checkpoint_file = self.output_dir / "theme_scrape_checkpoint.txt"
 
+        # Request starts are spaced delay_seconds apart across all worker threads
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+
+        # Parsed fields keyed by page content hash, so identical pages parse once
+        self._parsed_pages: Dict[str, Tuple[Optional[int], str, str, int]] = {}
+
     def _setup_session(self) -> requests.Session:
         """Configure requests session"""
-        session = requests.Session()
+        if self.http_cache:
+            # Only needed when a cache is asked for
+            from requests_cache import CachedSession
+
+            session = CachedSession(
+                cache_name=self.http_cache,
+                backend="sqlite",
+                expire_after=86400,
+                allowable_methods=("GET",),
+            )
+        else:
+            session = requests.Session()
         session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (compatible; NahuatLEX-ThemeScraper/1.0)",
                 "Accept": "text/html,application/xhtml+xml",
             }
         )
+
+        # Keep a pooled connection for every worker thread, transient errors
+        # (including 429 with Retry-After) retried with backoff
+        adapter = HTTPAdapter(
+            pool_connections=self.workers,
+            pool_maxsize=max(self.workers, 10),
+            max_retries=Retry(
+                total=self.max_retries,
+                backoff_factor=self.delay_seconds,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         return session
 
+    def _wait_for_request_slot(self):
+        """Block until this thread may start a request, keeping the overall rate polite"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = (
+                max(now, self._next_request_time) + self.delay_seconds
+            )
+        if wait > 0:
+            time.sleep(wait)
+
+    def _is_cached(self, url: str) -> bool:
+        """Whether the cache holds an unexpired response for url, which get() serves without a request"""
+        if not self.http_cache:
+            return False
+        cache = self.session.cache  # type: ignore
+        cached = cache.get_response(
+            cache.create_key(requests.Request("GET", url).prepare())
+        )
+        return cached is not None and not cached.is_expired
+
+    def save_checkpoint(self, idx: int):
+        """Atomically replace the checkpoint with the index of the last completed theme"""
+        tmp = self.checkpoint_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            f.write(str(idx))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_file)
+
     def _setup_logger(self) -> logging.Logger:
         """Configure logging"""
         logging.basicConfig(
@@ -74,7 +183,7 @@ class ThemeScraper:
         )
         return logging.getLogger(__name__)
 
-    def _extract_tid_from_page(self, soup: BeautifulSoup) -> Optional[int]:
+    def _extract_tid_from_page(self, tree: LexborHTMLParser) -> Optional[int]:
         """
         Extract taxonomy term ID from page
 
@@ -84,31 +193,23 @@ class ThemeScraper:
         3. Shortlink meta tag
         """
         # Try body class
-        body = soup.find("body")
-        if isinstance(body, Tag):
-            if body and body.get("class"):
-                for cls in body.get("class") or []:
-                    if cls.startswith("page-taxonomy-term-"):
-                        try:
-                            return int(cls.replace("page-taxonomy-term-", ""))
-                        except ValueError:
-                            pass
+        body = tree.css_first("body")
+        if body:
+            match = BODY_TID_RE.search(body.attributes.get("class") or "")
+            if match:
+                return int(match.group(1))
 
         # Try term div
-        term_div = soup.find("div", class_=lambda x: bool(x and "taxonomy-term-" in x))
-        if isinstance(term_div, Tag):
-            if term_div and term_div.get("class"):
-                for cls in term_div.get("class") or []:
-                    if cls.startswith("taxonomy-term-"):
-                        try:
-                            return int(cls.replace("taxonomy-term-", ""))
-                        except ValueError:
-                            pass
+        term_div = tree.css_first('div[class*="taxonomy-term-"]')
+        if term_div:
+            match = TERM_TID_RE.search(term_div.attributes.get("class") or "")
+            if match:
+                return int(match.group(1))
 
         # Try shortlink
-        shortlink = soup.find("link", rel="shortlink")
-        if shortlink and isinstance(shortlink, Tag):
-            href = str(shortlink.get("href", ""))
+        shortlink = tree.css_first('link[rel~="shortlink"]')
+        if shortlink:
+            href = shortlink.attributes.get("href") or ""
             if "/taxonomy/term/" in href:
                 try:
                     tid = href.split("/taxonomy/term/")[-1]
@@ -118,43 +219,71 @@ class ThemeScraper:
 
         return None
 
-    def _extract_theme_description(self, soup: BeautifulSoup) -> str:
+    def _extract_theme_description(self, tree: LexborHTMLParser) -> str:
         """Extract theme description from page"""
         # Try field-description
-        desc_div = soup.find(
-            "div", class_=lambda x: bool(x and "field-description" in x)
-        )
-        if desc_div and isinstance(desc_div, Tag):
-            field_item = desc_div.find("div", class_="field-item")
+        desc_div = tree.css_first('div[class*="field-description"]')
+        if desc_div:
+            field_item = desc_div.css_first("div.field-item")
             if field_item:
-                return field_item.get_text(strip=True)
+                return field_item.text(strip=True)
 
         # Try description meta tag
-        desc_meta = soup.find("meta", attrs={"name": "description"})
-        if desc_meta and isinstance(desc_meta, Tag):
-            return str(desc_meta.get("content", "")).strip()
+        desc_meta = tree.css_first('meta[name="description"]')
+        if desc_meta:
+            return (desc_meta.attributes.get("content") or "").strip()
 
         return ""
 
-    def _extract_entry_count(self, soup: BeautifulSoup) -> int:
+    def _extract_entry_count(self, tree: LexborHTMLParser) -> int:
         """Extract number of entries for this theme"""
         # Look for view header or pager info
-        view_header = soup.find("div", class_="view-header")
+        view_header = tree.css_first("div.view-header")
         if view_header:
-            text = view_header.get_text()
+            text = view_header.text()
             # Try to find "X entries" or similar
-            match = re.search(r"(\d+)\s+(?:entries|items|results)", text, re.IGNORECASE)
+            match = ENTRY_COUNT_RE.search(text)
             if match:
                 return int(match.group(1))
 
         # Count table rows (less reliable)
-        rows = soup.select("table.views-table tbody tr")
+        rows = tree.css("table.views-table tbody tr")
         if rows:
             # This might be paginated, so not accurate
             return len(rows)
 
         return 0
 
+    def _parse_theme_page(self, html: bytes) -> Tuple[Optional[int], str, str, int]:
+        """Extract (tid, name, description, entry_count), parsing identical pages once"""
+        key = hashlib.sha1(html).hexdigest()
+        parsed = self._parsed_pages.get(key)
+        if parsed is not None:
+            return parsed
+
+        tree = LexborHTMLParser(html)
+
+        # Extract theme data
+        tid = self._extract_tid_from_page(tree)
+
+        # Get theme name from page title or h1
+        name = ""
+        title_tag = tree.css_first("h1.page-title")
+        if title_tag:
+            name = title_tag.text(strip=True)
+        else:
+            # Fallback to title tag
+            title_meta = tree.css_first("title")
+            if title_meta:
+                name = title_meta.text(strip=True).split("|")[0].strip()
+
+        description = self._extract_theme_description(tree)
+        entry_count = self._extract_entry_count(tree)
+
+        parsed = (tid, name, description, entry_count)
+        self._parsed_pages[key] = parsed
+        return parsed
+
     def scrape_theme(self, slug: str) -> ThemeData:
         """
         Scrape a single theme page
@@ -163,64 +292,51 @@ class ThemeScraper:
             slug: Theme slug (e.g., "water", "agriculture-gardens-stockraising")
         """
         url = f"{self.base_url}/{slug}"
+        # Name used when the page gives none
+        display_name = slug.replace("-", " ").title()
 
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.get(url, timeout=self.timeout)
-
-                if response.status_code == 404:
-                    return ThemeData(
-                        tid=None,
-                        slug=slug,
-                        name=slug.replace("-", " ").title(),
-                        scrape_status="not_found",
-                        error_message="404 Not Found",
-                    )
-
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # Extract theme data
-                tid = self._extract_tid_from_page(soup)
-
-                # Get theme name from page title or h1
-                name = ""
-                title_tag = soup.find("h1", class_="page-title")
-                if title_tag:
-                    name = title_tag.get_text(strip=True)
-                else:
-                    # Fallback to title tag
-                    title_meta = soup.find("title")
-                    if title_meta:
-                        name = title_meta.get_text(strip=True).split("|")[0].strip()
-
-                if not name:
-                    name = slug.replace("-", " ").title()
-
-                description = self._extract_theme_description(soup)
-                entry_count = self._extract_entry_count(soup)
+        try:
+            # Cached pages never reach the site, so they skip the rate limit
+            if not self._is_cached(url):
+                self._wait_for_request_slot()
+            response = self.session.get(url, timeout=self.timeout)
 
+            if response.status_code == 404:
                 return ThemeData(
-                    tid=tid,
+                    tid=None,
                     slug=slug,
-                    name=name,
-                    description=description,
-                    entry_count=entry_count,
-                    url_alias=f"/themes/{slug}",
-                    scrape_timestamp=datetime.now().isoformat(),
-                    scrape_status="success",
+                    name=display_name,
+                    scrape_status="not_found",
+                    error_message="404 Not Found",
                 )
 
-            except requests.RequestException as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed for {slug}: {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.delay_seconds * (attempt + 1))
+            response.raise_for_status()
+            tid, name, description, entry_count = self._parse_theme_page(
+                response.content
+            )
+
+            if not name:
+                name = display_name
+
+            return ThemeData(
+                tid=tid,
+                slug=slug,
+                name=name,
+                description=description,
+                entry_count=entry_count,
+                url_alias=f"/themes/{slug}",
+                scrape_timestamp=datetime.now().isoformat(),
+                scrape_status="success",
+            )
+
+        except requests.RequestException as e:
+            # The session adapter has already retried transient failures
+            self.logger.warning(f"Request failed for {slug}: {e}")
 
-        # All retries failed
         return ThemeData(
             tid=None,
             slug=slug,
-            name=slug.replace("-", " ").title(),
+            name=display_name,
             scrape_status="error",
             error_message="Max retries exceeded",
         )
@@ -235,11 +351,12 @@ class ThemeScraper:
             slug_file: Path to file with one slug per line
             resume: Resume from checkpoint
         """
-        # Load slugs from file
-        with open(slug_file, "r", encoding="utf-8") as f:
-            slugs = [
-                line.strip() for line in f if line.strip() and not line.startswith("#")
-            ]
+        # Load slugs from file in one read, filtering lines before decoding them
+        slugs = [
+            slug.decode("utf-8")
+            for line in Path(slug_file).read_bytes().splitlines()
+            if (slug := line.strip()) and not line.startswith(b"#")
+        ]
 
         # Resume from checkpoint
         start_idx = 0
@@ -250,36 +367,79 @@ class ThemeScraper:
 
         total = len(slugs)
         self.logger.info(
-            f"Scraping {total - start_idx} themes (indices {start_idx}-{total})"
+            f"Scraping {total - start_idx} themes (indices {start_idx}-{total}, "
+            f"{self.workers} workers)"
         )
 
         all_themes = []
+        last_checkpoint_idx = None
+
+        # Themes not yet in the Parquet file; flushed with each checkpoint so a
+        # checkpoint never covers themes that were not written
+        parquet_writer = self._open_parquet_writer(start_idx) if self.parquet else None
+        batch_start = 0
+
+        try:
+            # map() yields results in slug order; rate limiting happens per request
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = executor.map(self.scrape_theme, slugs[start_idx:])
+                for idx, theme_data in enumerate(results, start=start_idx):
+                    all_themes.append(theme_data)
+
+                    # Progress logging
+                    if (idx + 1) % 10 == 0:
+                        self.logger.info(
+                            f"Progress: {idx + 1}/{total} themes "
+                            f"({(idx + 1)/total*100:.1f}%)"
+                        )
+
+                    # Save checkpoint
+                    if (idx + 1) % CHECKPOINT_INTERVAL == 0:
+                        if parquet_writer is not None:
+                            self._write_parquet_batch(
+                                parquet_writer, all_themes[batch_start:]
+                            )
+                            batch_start = len(all_themes)
+                        self.save_checkpoint(idx)
+                        last_checkpoint_idx = idx
+        finally:
+            if parquet_writer is not None:
+                # Whatever was scraped is kept, even when the run is interrupted
+                if batch_start < len(all_themes):
+                    self._write_parquet_batch(parquet_writer, all_themes[batch_start:])
+                parquet_writer.close()
 
-        for idx, slug in enumerate(slugs[start_idx:], start=start_idx):
-            theme_data = self.scrape_theme(slug)
-            all_themes.append(theme_data)
+        # Final checkpoint
+        if last_checkpoint_idx != total - 1:
+            self.save_checkpoint(total - 1)
 
-            # Progress logging
-            if (idx + 1) % 10 == 0:
-                self.logger.info(
-                    f"Progress: {idx + 1}/{total} themes "
-                    f"({(idx + 1)/total*100:.1f}%)"
-                )
+        return all_themes
 
-            # Save checkpoint
-            if (idx + 1) % 10 == 0:
-                with open(self.checkpoint_file, "w") as f:
-                    f.write(str(idx))
+    def _open_parquet_writer(self, start_idx: int):
+        """Open a Parquet writer for this run; resumed runs get their own file"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
 
-            # Rate limiting
-            if idx < total - 1:
-                time.sleep(self.delay_seconds)
+        schema = pa.schema(
+            [
+                (name, pa.type_for_alias(alias))
+                for name, alias in THEME_ARROW_TYPES.items()
+            ]
+        )
+        filename = (
+            "themes.parquet" if start_idx == 0 else f"themes_from_{start_idx}.parquet"
+        )
+        filepath = self.output_dir / filename
+        self.logger.info(f"Writing themes to {filepath} as they are scraped")
+        # Repeated values such as scrape_status are dictionary-encoded by default
+        return pq.ParquetWriter(filepath, schema, compression="zstd")
 
-        # Final checkpoint
-        with open(self.checkpoint_file, "w") as f:
-            f.write(str(total - 1))
+    def _write_parquet_batch(self, writer, themes: List[ThemeData]):
+        """Append a batch of scraped themes to the open Parquet file"""
+        import pyarrow as pa
 
-        return all_themes
+        rows = [theme_row(theme) for theme in themes]
+        writer.write_table(pa.Table.from_pylist(rows, schema=writer.schema))
 
     def save_themes_csv(
         self, themes: List[ThemeData], filename: str = "themes.csv"
@@ -287,15 +447,18 @@ class ThemeScraper:
         """Save themes to CSV"""
         filepath = self.output_dir / filename
 
-        df = pd.DataFrame([asdict(theme) for theme in themes])
+        df = pd.DataFrame([theme_row(theme) for theme in themes])
         df.to_csv(filepath, index=False, encoding="utf-8-sig")
 
         self.logger.info(f"Saved {len(themes)} themes to {filepath}")
 
-        # Print statistics
-        successful = len(df[df["scrape_status"] == "success"])
-        not_found = len(df[df["scrape_status"] == "not_found"])
-        errors = len(df[df["scrape_status"] == "error"])
+        # Print statistics, counted from the themes rather than DataFrame slices
+        status_counts = Counter(theme.scrape_status for theme in themes)
+        successful = status_counts["success"]
+        not_found = status_counts["not_found"]
+        errors = status_counts["error"]
+        with_tid = sum(1 for theme in themes if theme.tid is not None)
+        total_entries = sum(theme.entry_count for theme in themes)
 
         self.logger.info("\n" + "=" * 70)
         self.logger.info("THEME SCRAPING SUMMARY")
@@ -304,8 +467,8 @@ class ThemeScraper:
         self.logger.info(f"Successful: {successful}")
         self.logger.info(f"Not found: {not_found}")
         self.logger.info(f"Errors: {errors}")
-        self.logger.info(f"Themes with TID: {df['tid'].notna().sum()}")
-        self.logger.info(f"Total entries across themes: {df['entry_count'].sum()}")
+        self.logger.info(f"Themes with TID: {with_tid}")
+        self.logger.info(f"Total entries across themes: {total_entries}")
 
         return str(filepath)
 
@@ -327,10 +490,29 @@ def main():
     parser.add_argument(
         "--delay", type=float, default=0.5, help="Delay between requests (seconds)"
     )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Themes fetched concurrently"
+    )
+    parser.add_argument(
+        "--http-cache",
+        default=None,
+        help="SQLite file caching theme pages for a day, to make re-runs instant",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Also write themes.parquet incrementally while scraping",
+    )
 
     args = parser.parse_args()
 
-    scraper = ThemeScraper(delay_seconds=args.delay, output_dir=args.output_dir)
+    scraper = ThemeScraper(
+        delay_seconds=args.delay,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        http_cache=args.http_cache,
+        parquet=args.parquet,
+    )
 
     themes = scraper.scrape_themes_from_file(
         slug_file=args.slug_file, resume=not args.no_resume
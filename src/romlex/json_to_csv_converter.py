@@ -1,42 +1,59 @@
-import json
 import csv
 from pathlib import Path
-import pandas as pd
 import sys
+from multiprocessing import Pool
+import orjson
+from openpyxl import Workbook
+
+# Entries handed to each worker process at a time; smaller inputs are flattened in-process
+FLATTEN_CHUNKSIZE = 1000
+
+CSV_FIELDS = ['entry_id', 'dialect_code', 'headword', 'part_of_speech', 'gloss']
 
 def flatten_entry_for_csv(entry):
-    """Flatten entry structure for CSV/Excel export"""
+    """Flatten entry structure for CSV/Excel export, as a row in CSV_FIELDS order"""
     
     glosses_formatted = []
     
-    for i, gloss_group in enumerate(entry.get('glosses', []), 1):
-        sense_parts = []
-        for sense in gloss_group:
-            translations = []
-            for trans in sense:
-                if 'translation' not in trans:
-                    continue
-                
-                if 'hint' in trans:
-                    translations.append(f"{trans['translation']} ({trans['hint']})")
-                else:
-                    translations.append(trans['translation'])
-            
-            if translations:
-                sense_parts.append(', '.join(translations))
+    for gloss_group in entry.get('glosses', []):
+        # Each sense's translations, "translation (hint)" where a hint is given;
+        # senses without any translation are dropped
+        sense_parts = [
+            ', '.join(translations)
+            for translations in (
+                [
+                    trans['translation'] + ' (' + trans['hint'] + ')' if 'hint' in trans
+                    else trans['translation']
+                    for trans in sense if 'translation' in trans
+                ]
+                for sense in gloss_group
+            )
+            if translations
+        ]
         
         if sense_parts:
             glosses_formatted.append('; '.join(sense_parts))
     
-    return {
-        'entry_id': entry.get('id', ''),
-        'dialect_code': entry.get('dialect', ''),
-        'headword': entry.get('orthographic_form', ''),
-        'part_of_speech': entry.get('pos', ''),
-        'gloss': ' | '.join(glosses_formatted) if glosses_formatted else ''
-    }
+    return (
+        entry.get('id', ''),
+        entry.get('dialect', ''),
+        entry.get('orthographic_form', ''),
+        entry.get('pos', ''),
+        ' | '.join(glosses_formatted)
+    )
+
+def flatten_entries(entries, workers=None):
+    """Yield flattened entries in input order, across worker processes for large inputs"""
+    
+    if workers == 1 or len(entries) <= FLATTEN_CHUNKSIZE:
+        for e in entries:
+            yield flatten_entry_for_csv(e)
+        return
+    
+    with Pool(workers) as pool:
+        yield from pool.imap(flatten_entry_for_csv, entries, chunksize=FLATTEN_CHUNKSIZE)
 
-def convert_json_to_csv(json_file):
+def convert_json_to_csv(json_file, workers=None):
     """Convert RomLex JSON to CSV and XLSX"""
     
     json_path = Path(json_file)
@@ -46,25 +63,29 @@ def convert_json_to_csv(json_file):
         sys.exit(1)
     
     print(f"Reading: {json_path}")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        entries = json.load(f)
+    # orjson decodes the UTF-8 bytes directly, without an intermediate str
+    entries = orjson.loads(json_path.read_bytes())
     
     print(f"Found {len(entries)} entries")
     
-    flattened_entries = [flatten_entry_for_csv(e) for e in entries]
-    
     csv_file = json_path.with_suffix('.csv')
-    print(f"Writing CSV: {csv_file}")
-    if flattened_entries:
-        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=flattened_entries[0].keys())
-            writer.writeheader()
-            writer.writerows(flattened_entries)
-    
     xlsx_file = json_path.with_suffix('.xlsx')
+    print(f"Writing CSV: {csv_file}")
     print(f"Writing XLSX: {xlsx_file}")
-    df = pd.DataFrame(flattened_entries)
-    df.to_excel(xlsx_file, index=False, engine='openpyxl')
+    
+    # Rows go to both outputs as they are flattened; the write-only workbook
+    # streams them to disk instead of holding the sheet in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    if entries:
+        ws.append(CSV_FIELDS)
+        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for row in flatten_entries(entries, workers):
+                writer.writerow(row)
+                ws.append(row)
+    wb.save(xlsx_file)
     
     print("\n✓ Conversion complete!")
     print(f"  CSV:  {csv_file}")
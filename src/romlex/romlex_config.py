@@ -1,8 +1,14 @@
 """
 Configuration for RomLex scraper
+
+Mappings are read-only views and sequences are tuples, so the shared
+configuration cannot be changed by accident at runtime.
 """
 
-DIALECT_NAMES = {
+from itertools import cycle
+from types import MappingProxyType
+
+DIALECT_NAMES = MappingProxyType({
     'rmcb': 'Burgenland Romani',
     'rmcd': 'Dolenjski Romani', 
     'rmce': 'East Slovak Romani',
@@ -30,42 +36,45 @@ DIALECT_NAMES = {
     'roml': 'Latvian Romani',
     'romr': 'North Russian Romani',
     'romt': 'Lithuanian Romani'
-}
+})
 
-PATTERN_MATCH_MODES = {
+PATTERN_MATCH_MODES = MappingProxyType({
     'prefix': 'pr',
     'infix': 'in',
     'suffix': 'su',
     'fuzzy': 'fu'
-}
+})
 
-SEARCH_PARAMS = {
+SEARCH_PARAMS = MappingProxyType({
     'reverse': 'n',
     'ignore_case': 'y',
     'ignore_marks': 'y',
     'word_class': '',
     'file': ''
-}
+})
 
-API_CONFIG = {
+API_CONFIG = MappingProxyType({
     'base_url': 'http://romani.uni-graz.at/romlex/lex.cgi',
     'referer': 'http://romani.uni-graz.at/romlex/',
     'result_limit': 200,
     'default_translation': 'en'
-}
+})
 
-SCRAPER_CONFIG = {
-    'request_delay': 3.0, 
+SCRAPER_CONFIG = MappingProxyType({
+    'target_rps': 0.5,
+    'rate_burst': 2,
+    'min_rps': 0.05,
+    'rate_recover_after': 20,
     'error_retry_delay': 10.0,
     'max_retries': 3,
     'backoff_multiplier': 2.0,
     'default_output_dir': 'data/',
-    'inter_letter_delay': 5.0,
+    'cache_expire_days': 7,
     'rotate_user_agent': True,
-    'use_session': True
-}
+    'workers': 4
+})
 
-USER_AGENTS = [
+USER_AGENTS = (
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
@@ -74,13 +83,20 @@ USER_AGENTS = [
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/119.0.0.0',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-]
+)
 
-HEADERS = {
+HEADERS = MappingProxyType({
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.9',
     'Accept-Encoding': 'gzip, deflate',
     'Connection': 'keep-alive',
     'Referer': 'http://romani.uni-graz.at/romlex/'
-}
\ No newline at end of file
+})
+
+_USER_AGENT_CYCLE = cycle(USER_AGENTS)
+
+
+def next_user_agent():
+    """Next user agent in the rotation through USER_AGENTS"""
+    return next(_USER_AGENT_CYCLE)
@@ -1,13 +1,18 @@
 import requests
-import xml.etree.ElementTree as ET
-from time import sleep
+from requests.adapters import HTTPAdapter
+from lxml import etree
+import io
+from time import sleep, monotonic
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import json
+import orjson
 import csv
-from datetime import datetime
+from datetime import datetime, timedelta
 import string
-import pandas as pd
+import unicodedata
+from openpyxl import Workbook
 import sys
 
 from romlex_config import (
@@ -17,16 +22,73 @@ from romlex_config import (
     API_CONFIG,
     SCRAPER_CONFIG,
     HEADERS,
-    USER_AGENTS
+    next_user_agent
 )
 
+CSV_FIELDS = ['entry_id', 'dialect_code', 'headword', 'part_of_speech', 'gloss']
+
+def fold_headword(text):
+    """Lowercase and strip diacritics, as the search does with ignore_case and ignore_marks"""
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+class TokenBucket:
+    """Thread-safe token bucket: requests average at most rate per second, bursting to capacity"""
+    
+    def __init__(self, rate, capacity, recover_after=20):
+        self.rate = rate
+        self.capacity = capacity
+        # Consecutive successful requests before a lowered rate is doubled again
+        self.recover_after = recover_after
+        self._tokens = capacity
+        self._updated = monotonic()
+        self._successes = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may start"""
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            sleep(wait)
+    
+    def slow_down(self, min_rate):
+        """Halve the rate, no lower than min_rate"""
+        with self._lock:
+            self.rate = max(self.rate / 2, min_rate)
+            self._successes = 0
+    
+    def record_success(self, max_rate):
+        """Count a successful request, doubling a lowered rate back toward max_rate after a run of them"""
+        with self._lock:
+            if self.rate >= max_rate:
+                return
+            self._successes += 1
+            if self._successes >= self.recover_after:
+                self.rate = min(self.rate * 2, max_rate)
+                self._successes = 0
+
 class RomLexScraper:
-    def __init__(self, dialect_code, output_dir=None):
+    def __init__(self, dialect_code, output_dir=None, workers=None, use_cache=False, clear_cache=False, xlsx=False,
+                 prune_prefixes=False):
         self.dialect_code = dialect_code
+        # Skip sub-prefixes a truncated response appears to rule out; see child_letters
+        self.prune_prefixes = prune_prefixes
+        # JSON and CSV are always written; the spreadsheet copy is opt-in
+        self.xlsx = xlsx
+        # Sibling prefixes queried concurrently when a prefix is subdivided
+        self.workers = workers or SCRAPER_CONFIG['workers']
         self.output_dir = Path(output_dir or SCRAPER_CONFIG['default_output_dir'])
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Queries are deterministic, so responses can be cached on disk across runs (opt-in)
+        self.use_cache = use_cache
         self.base_url = API_CONFIG['base_url']
-        self.all_entries = []
         self.duplicate_entries = set()
         self.stats = {
             'dialect': dialect_code,
@@ -38,17 +100,90 @@ class RomLexScraper:
             'letters_processed': [],
             'duplicate_entries': 0,
         }
-        self.session = requests.Session() if SCRAPER_CONFIG.get('use_session') else None
+        self.session = self._setup_session()
+        if use_cache and clear_cache:
+            self.session.cache.clear()
         self.headers = HEADERS.copy()
+        
+        # Caps the request rate across all threads; responses add no extra wait
+        self._limiter = TokenBucket(
+            SCRAPER_CONFIG['target_rps'],
+            SCRAPER_CONFIG['rate_burst'],
+            SCRAPER_CONFIG['rate_recover_after']
+        )
+        self._stats_lock = threading.Lock()
+        self._session_lock = threading.Lock()
+    
+    def _setup_session(self):
+        """One session for every query, keeping connections to the RomLex host alive"""
+        if self.use_cache:
+            # Only needed when caching
+            from requests_cache import CachedSession
+            session = CachedSession(
+                cache_name=str(self.output_dir / 'http_cache.sqlite'),
+                backend='sqlite',
+                expire_after=timedelta(days=SCRAPER_CONFIG['cache_expire_days']),
+                allowable_methods=('GET',),
+                match_headers=False
+            )
+        else:
+            session = requests.Session()
+        
+        # Every query goes to the same host; keep a connection per worker thread.
+        # Retries stay in query_romlex, which backs off on 403
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.workers, 10))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
-    def get_random_user_agent(self):
-        """Get a random user agent from the pool"""
+    def _is_cached(self, url):
+        """Whether the cache holds an unexpired response for url, which get() serves without a request"""
+        if not self.use_cache:
+            return False
+        cache = self.session.cache
+        cached = cache.get_response(cache.create_key(requests.Request('GET', url).prepare()))
+        return cached is not None and not cached.is_expired
+    
+    def _drop_cache(self, error):
+        """Switch every thread to a plain session after the cache backend fails"""
+        with self._session_lock:
+            if not self.use_cache:
+                return
+            print(f"    Response cache failed ({error!r}), continuing without it")
+            self.use_cache = False
+            self.session = self._setup_session()
+    
+    def _fetch(self, url, headers):
+        """GET url, rate-limited unless a fresh cached response answers it
+        
+        Returns the response and whether it came from the site. Errors from
+        the cache backend itself turn the cache off for the rest of the run
+        instead of surfacing as failed queries.
+        """
+        session, cached = self.session, self.use_cache
+        try:
+            fetched = not self._is_cached(url)
+            if fetched:
+                self._limiter.acquire()
+            return session.get(url, headers=headers, timeout=30), fetched
+        except requests.exceptions.RequestException:
+            raise
+        except Exception as e:
+            if not cached:
+                raise
+            self._drop_cache(e)
+        
+        self._limiter.acquire()
+        return self.session.get(url, headers=headers, timeout=30), True
+    
+    def _user_agent(self):
+        """Get the next user agent from the rotation"""
         if SCRAPER_CONFIG.get('rotate_user_agent'):
-            return random.choice(USER_AGENTS)
-        return self.headers.get('User-Agent')
+            return next_user_agent()
+        return self.headers['User-Agent']
     
     def query_romlex(self, search_term, translation=None, pattern_match=None, retry_count=0):
-        """Query the RomLex database with retry logic"""
+        """Query the RomLex database with retry logic, returning the extracted entries"""
         
         translation = translation or API_CONFIG['default_translation']
         pattern_match = pattern_match or PATTERN_MATCH_MODES['prefix']
@@ -66,33 +201,24 @@ class RomLexScraper:
         }
         
         headers = self.headers.copy()
-        headers['User-Agent'] = self.get_random_user_agent() # type: ignore
+        headers['User-Agent'] = self._user_agent()
+        url = requests.Request('GET', self.base_url, params=params).prepare().url
         
         try:
-            if self.session:
-                response = self.session.get(
-                    self.base_url, 
-                    params=params, 
-                    headers=headers, 
-                    timeout=30
-                )
-            else:
-                response = requests.get(
-                    self.base_url, 
-                    params=params, 
-                    headers=headers, 
-                    timeout=30
-                )
+            # Cached responses never reach the site, so they skip the rate limit
+            response, fetched = self._fetch(url, headers)
             
             response.encoding = 'utf-8'
             response.raise_for_status()
             
-            self.stats['total_queries'] += 1
+            # A 403 halves the shared rate; once the server accepts requests again it recovers
+            if fetched:
+                self._limiter.record_success(SCRAPER_CONFIG['target_rps'])
             
-            root = ET.fromstring(response.content)
-            entries = root.findall('.//entry')
+            with self._stats_lock:
+                self.stats['total_queries'] += 1
             
-            return entries, root
+            return self.parse_entries(response.content)
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 403 and retry_count < SCRAPER_CONFIG['max_retries']:
@@ -100,13 +226,31 @@ class RomLexScraper:
                 jitter = random.uniform(0, 2)
                 total_wait = wait_time + jitter
                 
-                print(f"    403 error, retrying in {total_wait:.1f}s (attempt {retry_count + 1}/{SCRAPER_CONFIG['max_retries']})")
+                # The server is pushing back; lower the shared rate as well as backing off
+                self._limiter.slow_down(SCRAPER_CONFIG['min_rps'])
+                
+                print(f"    403 error, retrying in {total_wait:.1f}s (attempt {retry_count + 1}/{SCRAPER_CONFIG['max_retries']}, "
+                      f"rate now {self._limiter.rate:.2f} req/s)")
                 sleep(total_wait)
                 
                 return self.query_romlex(search_term, translation, pattern_match, retry_count + 1)
             else:
                 raise
     
+    def parse_entries(self, content):
+        """Stream-parse a response, extracting each entry and freeing its elements as it goes"""
+        
+        entries = []
+        for _, elem in etree.iterparse(io.BytesIO(content), tag='entry'):
+            entries.append(self.extract_entry_data(elem))
+            
+            # Drop the parsed entry and the siblings already handled before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        
+        return entries
+    
     def extract_entry_data(self, entry):
         """Extract all data from an entry element"""
         
@@ -181,120 +325,173 @@ class RomLexScraper:
             'gloss': ' | '.join(glosses_formatted)
         }
     
-    def get_entries_recursive(self, prefix, depth=0):
-        """Recursively fetch all entries, subdividing when hitting 200-entry limit"""
+    def query_prefix(self, prefix, depth=0):
+        """Query one prefix for its extracted entries, None if the query failed"""
         
         indent = "  " * depth
         
         try:
-            entries, root = self.query_romlex(prefix)
-            count = len(entries)
-            
-            print(f"{indent}'{prefix}': {count} entries")
-            
-            if count < API_CONFIG['result_limit']:
-                delay = SCRAPER_CONFIG['request_delay'] + random.uniform(0, 1.0)
-                sleep(delay)
-                extracted_entries = []
-                duplicates = 0
-                
-                for e in entries:
-                    entry_id = e.get('id')
-                    if entry_id and entry_id not in self.duplicate_entries:
-                        self.duplicate_entries.add(entry_id)
-                        extracted_entries.append(self.extract_entry_data(e))
-                    elif entry_id:
-                        duplicates += 1
-                        self.stats['duplicate_entries'] += 1
-                
-                if duplicates > 0:
-                    print(f" ({duplicates} duplicates skipped)")
-                else:
-                    print()
-                
-                return extracted_entries
-            
-            print(f"{indent}  Limit hit, subdividing...")
-            all_entries = []
-            
-            alphabet = string.ascii_lowercase
-            for letter in alphabet:
-                sub_prefix = prefix + letter
-                sub_entries = self.get_entries_recursive(sub_prefix, depth + 1)
-                all_entries.extend(sub_entries)
-                delay = SCRAPER_CONFIG['request_delay'] + random.uniform(0, 1.0)
-                sleep(delay)
-            
-            return all_entries
-            
+            entries = self.query_romlex(prefix)
         except Exception as e:
             print(f"{indent}Error querying '{prefix}': {e}")
-            self.stats['failed_queries'] += 1
+            with self._stats_lock:
+                self.stats['failed_queries'] += 1
             sleep(SCRAPER_CONFIG['error_retry_delay'])
-            return []
+            return None
+        
+        print(f"{indent}'{prefix}': {len(entries)} entries")
+        return entries
     
-    def scrape_full_dialect(self):
-        """Scrape entire dialect dictionary"""
+    def child_letters(self, prefix, entries):
+        """Letters worth appending to a prefix whose results hit the limit
         
-        print(f"Starting full scrape for dialect: {self.dialect_code}")
-        print(f"Dialect name: {self.stats['dialect_name']}")
-        print(f"Output directory: {self.output_dir}")
-        print(f"Request delay: {SCRAPER_CONFIG['request_delay']}s (+ jitter)")
-        print(f"User-Agent rotation: {SCRAPER_CONFIG.get('rotate_user_agent', False)}")
-        print(f"Session management: {SCRAPER_CONFIG.get('use_session', False)}")
+        Every letter unless prune_prefixes is set. Pruning assumes lex.cgi
+        returns the first matches in sorted order, so that any unseen letter
+        before the last continuation seen has no entries. That has not been
+        confirmed against the live server: if it picks any matches and sorts
+        only those, whole sub-prefixes would be dropped without notice. Even
+        when pruning, every letter is kept whenever the response itself
+        contradicts the assumption (unsorted results, headwords not starting
+        with the prefix, continuations outside a-z).
+        """
+        alphabet = string.ascii_lowercase
+        if not self.prune_prefixes:
+            return alphabet
+        folded = [fold_headword(entry['orthographic_form']) for entry in entries]
+        
+        if folded != sorted(folded) or not all(h.startswith(prefix) for h in folded):
+            return alphabet
+        
+        continuations = {h[len(prefix)] for h in folded if len(h) > len(prefix)}
+        if not continuations or not continuations <= set(alphabet):
+            return alphabet
+        
+        last = max(continuations)
+        return ''.join(letter for letter in alphabet if letter in continuations or letter > last)
+    
+    def get_entries_recursive(self, prefix, depth=0):
+        """Yield all entries under a prefix, subdividing when hitting 200-entry limit
+        
+        Each level of sub-prefixes is queried concurrently. Entries are
+        yielded in prefix order, the order of a depth-first walk.
+        """
+        
+        # Prefixes whose results fit under the limit, with their entries
+        complete = {}
+        level = [prefix]
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while level:
+                sub_depth = depth + len(level[0]) - len(prefix)
+                results = executor.map(self.query_prefix, level, [sub_depth] * len(level))
+                
+                next_level = []
+                for sub_prefix, entries in zip(level, results):
+                    if entries is None:
+                        continue
+                    if len(entries) < API_CONFIG['result_limit']:
+                        complete[sub_prefix] = entries
+                    else:
+                        letters = self.child_letters(sub_prefix, entries)
+                        print(f"{'  ' * sub_depth}  '{sub_prefix}': limit hit, subdividing into {len(letters)} prefixes...")
+                        next_level.extend(sub_prefix + letter for letter in letters)
+                level = next_level
+        
+        duplicates = 0
+        
+        # No complete prefix extends another, so sorted order is depth-first order
+        for sub_prefix in sorted(complete):
+            for entry in complete[sub_prefix]:
+                entry_id = entry['id']
+                if entry_id and entry_id not in self.duplicate_entries:
+                    self.duplicate_entries.add(entry_id)
+                    yield entry
+                elif entry_id:
+                    duplicates += 1
+                    self.stats['duplicate_entries'] += 1
+        
+        if duplicates > 0:
+            print(f"{'  ' * depth}({duplicates} duplicates skipped)")
+    
+    def scrape_entries(self):
+        """Yield every entry of the dialect, letter by letter, recording per-letter counts"""
         
         alphabet = string.ascii_lowercase
+        total = 0
         
         for i, letter in enumerate(alphabet, 1):
             print(f"\n[{i}/{len(alphabet)}] Processing letter '{letter}':")
-            entries = self.get_entries_recursive(letter)
-            self.all_entries.extend(entries)
+            count = 0
+            for entry in self.get_entries_recursive(letter):
+                count += 1
+                yield entry
+            total += count
             self.stats['letters_processed'].append({
                 'letter': letter,
-                'count': len(entries)
+                'count': count
             })
-            print(f"  Total for '{letter}': {len(entries)} entries")
-            print(f"  Running total: {len(self.all_entries)} entries")
-            
-            if i < len(alphabet):
-                inter_delay = SCRAPER_CONFIG.get('inter_letter_delay', 0)
-                if inter_delay > 0:
-                    print(f"  Waiting {inter_delay}s before next letter...")
-                    sleep(inter_delay)
+            print(f"  Total for '{letter}': {count} entries")
+            print(f"  Running total: {total} entries")
         
-        self.stats['total_entries'] = len(self.all_entries)
+        self.stats['total_entries'] = total
         self.stats['end_time'] = datetime.now().isoformat()
+    
+    def scrape_full_dialect(self):
+        """Scrape entire dialect dictionary"""
         
-        if self.session:
-            self.session.close()
+        print(f"Starting full scrape for dialect: {self.dialect_code}")
+        print(f"Dialect name: {self.stats['dialect_name']}")
+        print(f"Output directory: {self.output_dir}")
+        print(f"Response cache: {self.output_dir / 'http_cache.sqlite' if self.use_cache else 'off'}")
+        print(f"Request rate: up to {SCRAPER_CONFIG['target_rps']} req/s (bursts of {SCRAPER_CONFIG['rate_burst']})")
+        print(f"Concurrent queries: {self.workers}")
+        print(f"User-Agent rotation: {SCRAPER_CONFIG.get('rotate_user_agent', False)}")
         
-        self.save_results()
+        # Entries are written out as each letter's prefixes complete
+        try:
+            self.save_results(self.scrape_entries())
+        finally:
+            self.session.close()
     
-    def save_results(self):
-        """Save scraped data in JSON, CSV, and XLSX formats"""
+    def save_results(self, entries):
+        """Save entries in JSON, CSV, and XLSX formats as they arrive, then the stats"""
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         json_file = self.output_dir / f"{self.dialect_code}_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.all_entries, f, ensure_ascii=False, indent=2)
+        csv_file = self.output_dir / f"{self.dialect_code}_{timestamp}.csv"
+        xlsx_file = self.output_dir / f"{self.dialect_code}_{timestamp}.xlsx"
         
-        flattened_entries = [self.flatten_entry_for_csv(e) for e in self.all_entries]
+        if self.xlsx:
+            # Write-only workbooks stream rows to disk instead of building every cell in memory
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet('Sheet1')
+            ws.append(CSV_FIELDS)
         
-        csv_file = self.output_dir / f"{self.dialect_code}_{timestamp}.csv"
-        if flattened_entries:
-            with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=flattened_entries[0].keys())
-                writer.writeheader()
-                writer.writerows(flattened_entries)
+        # One pass over the entries feeds all outputs; the JSON array is written
+        # entry by entry in the layout json.dump(..., indent=2) would give it
+        with open(json_file, 'wb') as jf, \
+                open(csv_file, 'w', encoding='utf-8', newline='') as cf:
+            writer = csv.DictWriter(cf, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            jf.write(b'[')
+            count = 0
+            for entry in entries:
+                # Encoded strings never hold raw newlines, so this only indents structure
+                jf.write(b'\n  ' if count == 0 else b',\n  ')
+                jf.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+                row = self.flatten_entry_for_csv(entry)
+                writer.writerow(row)
+                if self.xlsx:
+                    ws.append(list(row.values()))
+                count += 1
+            jf.write(b'\n]' if count else b']')
         
-        xlsx_file = self.output_dir / f"{self.dialect_code}_{timestamp}.xlsx"
-        df = pd.DataFrame(flattened_entries)
-        df.to_excel(xlsx_file, index=False, engine='openpyxl')
+        if self.xlsx:
+            wb.save(xlsx_file)
         
         stats_file = self.output_dir / f"{self.dialect_code}_{timestamp}_stats.json"
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        stats_file.write_bytes(orjson.dumps(self.stats, option=orjson.OPT_INDENT_2))
         
         print("Scraping complete!")
         print(f"Dialect: {self.stats['dialect_name']} ({self.dialect_code})")
@@ -310,13 +507,14 @@ class RomLexScraper:
         print(f"\nFiles saved:")
         print(f"  JSON: {json_file}")
         print(f"  CSV:  {csv_file}")
-        print(f"  XLSX: {xlsx_file}")
+        if self.xlsx:
+            print(f"  XLSX: {xlsx_file}")
         print(f"  Stats: {stats_file}")
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         print("RomLex Dictionary Scraper")
-        print("\nUsage: python romlex_scraper.py <dialect_code>")
+        print("\nUsage: python romlex_scraper.py <dialect_code> [--http-cache | --refresh-cache] [--xlsx] [--prune-prefixes]")
         print("\nAvailable dialects:")
         for code, name in sorted(DIALECT_NAMES.items()):
             print(f"  {code} - {name}")
@@ -330,6 +528,15 @@ if __name__ == '__main__':
         print(f"Run without arguments to see available dialects.")
         sys.exit(1)
     
+    # --refresh-cache clears the cache, then refills it as every query is refetched
+    clear_cache = '--refresh-cache' in sys.argv[2:]
+    # --http-cache keeps responses in an on-disk cache so re-runs skip the site
+    use_cache = clear_cache or '--http-cache' in sys.argv[2:]
+    # --xlsx adds a spreadsheet copy alongside the JSON and CSV
+    xlsx = '--xlsx' in sys.argv[2:]
+    # --prune-prefixes skips sub-prefixes a sorted truncated response rules out (experimental)
+    prune_prefixes = '--prune-prefixes' in sys.argv[2:]
+    
     print(f"Dialect: {DIALECT_NAMES[dialect]} ({dialect})")
     confirm = input("Start scraping? [y/N]: ")
     
@@ -337,5 +544,11 @@ if __name__ == '__main__':
         print("Cancelled.")
         sys.exit(0)
     
-    scraper = RomLexScraper(dialect)
+    scraper = RomLexScraper(
+        dialect,
+        use_cache=use_cache,
+        clear_cache=clear_cache,
+        xlsx=xlsx,
+        prune_prefixes=prune_prefixes
+    )
     scraper.scrape_full_dialect()
\ No newline at end of file